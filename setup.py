@@ -31,5 +31,8 @@ setup(
         'gameframe',
         'weakreflist',
     ],
+    extras_require = {
+        'batch': ['numpy'],
+    },
 
 )
\ No newline at end of file
@@ -8,12 +8,15 @@ from gameframe.events import GameEvent
 
 
 class GameArtifact(SessionBound):
+    __slots__ = ('_connected_conditions',)
 
     def __init__(self, game: EventSession, event: GameEvent):
         super().__init__(game)
-        self._connected_conditions = WeakList()
+        self._connected_conditions: t.Optional[WeakList] = None
 
     def create_condition(self, condition_type: t.Type[Condition], parent: GameEvent, **kwargs):
+        if self._connected_conditions is None:
+            self._connected_conditions = WeakList()
         self._connected_conditions.append(
             self._session.create_condition(
                 condition_type = condition_type,
@@ -12,6 +12,7 @@ from sunkingdoms.zones import Zoneable, Zone
 
 
 class Price(object):
+    __slots__ = ('_amount',)
 
     def __init__(self, amount: int):
         self._amount = amount
@@ -22,16 +23,26 @@ class Price(object):
 
 
 class Cardboard(Zoneable, Target):
+    __slots__ = ('_printed_card_type', '_card', '_zone', '_id')
 
     def __init__(self, game: EventSession, event: GameEvent, card_type: t.Type[Card]):
         super().__init__(game, event)
         self._printed_card_type = card_type
         self._card = card_type(self, event)
         self._zone = None
+        self._id: int = game.register_cardboard(self)
 
     def attack(self, damage: int, event: GameEvent):
         self._card.attack(damage, event)
 
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._card.name
+
     @property
     def card(self) -> Card:
         return self._card
@@ -46,27 +57,18 @@ class Cardboard(Zoneable, Target):
 
 
 class Action(object):
+    __slots__ = ('_text',)
 
     def __init__(self, text: str):
-        self._exhausted = False
         self._text = text
 
     @property
     def text(self) -> str:
         return self._text
 
-    def exhaust(self) -> None:
-        self._exhausted = True
-
-    def refresh(self) -> None:
-        self._exhausted = False
-
     def requirements_fulfilled(self, event: GameEvent) -> bool:
         pass
 
-    def available(self, event: GameEvent) -> bool:
-        return not self._exhausted and self.requirements_fulfilled(event)
-
     def cost(self, event: GameEvent):
         pass
 
@@ -78,16 +80,37 @@ class Action(object):
 
 
 class Actions(object):
+    __slots__ = ('_actions', '_exhausted')
 
-    def __init__(self, actions: t.Iterable[Action]):
-        self._actions = list(actions)
+    def __init__(self, actions: t.Tuple[Action, ...]):
+        self._actions = actions
+        self._exhausted = 0
 
     def __iter__(self) -> t.Iterator[Action]:
         return self._actions.__iter__()
 
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    @property
+    def exhausted(self) -> int:
+        return self._exhausted
+
+    @exhausted.setter
+    def exhausted(self, exhausted: int) -> None:
+        self._exhausted = exhausted
+
+    def is_exhausted(self, action: Action) -> bool:
+        return bool(self._exhausted & 1 << self._actions.index(action))
+
+    def exhaust(self, action: Action) -> None:
+        self._exhausted |= 1 << self._actions.index(action)
+
+    def available(self, action: Action, event: GameEvent) -> bool:
+        return not self.is_exhausted(action) and action.requirements_fulfilled(event)
+
     def refresh(self) -> None:
-        for action in self._actions:
-            action.refresh()
+        self._exhausted = 0
 
 
 class Faction(Enum):
@@ -103,6 +126,8 @@ class CardType(Enum):
 
 
 class Card(object):
+    __slots__ = ('_cardboard', '_actions')
+
     name: str
     price: Price
     factions: t.FrozenSet[Faction] = frozenset()
@@ -110,10 +135,31 @@ class Card(object):
 
     health: int = 0
     outpost: bool = False
+    card_id: t.Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.card_id = None
 
     def __init__(self, cardboard: Cardboard, event: GameEvent):
         self._cardboard = cardboard
-        self._actions = Actions(())
+        self._actions = Actions(self.action_definitions())
+
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return ()
+
+    @classmethod
+    def action_definitions(cls) -> t.Tuple[Action, ...]:
+        try:
+            return cls.__dict__['_action_definitions']
+        except KeyError:
+            definitions = tuple(cls.create_actions())
+            cls._action_definitions = definitions
+            return definitions
+
+    def enter_play(self, event: t.Optional[GameEvent]):
+        pass
 
     def on_play(self, event: GameEvent):
         pass
@@ -6,6 +6,8 @@ from sunkingdoms import events as e
 
 
 class Base(Card):
+    __slots__ = ()
+
     card_type = CardType.BASE
 
     def attack(self, damage: int, event: e.Attack):
@@ -4,6 +4,7 @@ from gameframe.events import GameEvent
 
 
 class Target(ABC):
+    __slots__ = ()
 
     @abstractmethod
     def attack(self, damage: int, event: GameEvent):
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import typing as t
+
+from sunkingdoms.artifacts.artifacts import Action, Card, CardType, Faction, Price
+
+
+C = t.TypeVar('C', bound = t.Type[Card])
+
+
+class InvalidCard(Exception):
+    pass
+
+
+FACTIONS: t.Tuple[Faction, ...] = tuple(Faction)
+
+FACTION_BITS: t.Mapping[Faction, int] = {
+    faction: 1 << index
+    for index, faction in
+    enumerate(FACTIONS)
+}
+
+CARD_TYPES: t.List[t.Type[Card]] = []
+NAMES: t.List[str] = []
+PRICES: t.List[int] = []
+FACTION_MASKS: t.List[int] = []
+HEALTH: t.List[int] = []
+BASES: t.List[bool] = []
+OUTPOSTS: t.List[bool] = []
+
+
+def faction_mask(factions: t.Iterable[Faction]) -> int:
+    mask = 0
+    for faction in factions:
+        mask |= FACTION_BITS[faction]
+    return mask
+
+
+def price(card: Card) -> int:
+    card_id = card.card_id
+    return card.price.amount if card_id is None else PRICES[card_id]
+
+
+def health(card: Card) -> int:
+    card_id = card.card_id
+    return card.health if card_id is None else HEALTH[card_id]
+
+
+def is_base(card: Card) -> bool:
+    card_id = card.card_id
+    return card.card_type == CardType.BASE if card_id is None else BASES[card_id]
+
+
+def is_outpost(card: Card) -> bool:
+    card_id = card.card_id
+    return card.outpost if card_id is None else OUTPOSTS[card_id]
+
+
+def _validate(card_type: t.Type[Card]) -> None:
+    if not isinstance(getattr(card_type, 'name', None), str) or not card_type.name:
+        raise InvalidCard('{} has no name'.format(card_type.__name__))
+    if not isinstance(getattr(card_type, 'price', None), Price):
+        raise InvalidCard('{} price must be a Price, got {!r}'.format(card_type.name, card_type.__dict__.get('price')))
+    if not isinstance(card_type.price.amount, int) or card_type.price.amount < 0:
+        raise InvalidCard('{} has invalid price {!r}'.format(card_type.name, card_type.price.amount))
+    if (
+        not isinstance(card_type.factions, frozenset)
+        or not all(isinstance(faction, Faction) for faction in card_type.factions)
+    ):
+        raise InvalidCard('{} factions must be a frozenset of Faction'.format(card_type.name))
+    if not isinstance(card_type.card_type, CardType):
+        raise InvalidCard('{} has invalid card type {!r}'.format(card_type.name, card_type.card_type))
+    if card_type.card_type == CardType.BASE and card_type.health <= 0:
+        raise InvalidCard('base {} must have positive health'.format(card_type.name))
+    if card_type.card_type != CardType.BASE and (card_type.health or card_type.outpost):
+        raise InvalidCard('ship {} cannot have health or be an outpost'.format(card_type.name))
+    if not all(isinstance(action, Action) for action in card_type.action_definitions()):
+        raise InvalidCard('{} defines actions that are not Action instances'.format(card_type.name))
+    if card_type.name in NAMES:
+        raise InvalidCard('card name {} is already registered'.format(card_type.name))
+
+
+def register(card_type: C) -> C:
+    if card_type.__dict__.get('card_id') is not None:
+        raise InvalidCard('{} is already registered'.format(card_type.name))
+    _validate(card_type)
+    card_type.card_id = len(CARD_TYPES)
+    CARD_TYPES.append(card_type)
+    NAMES.append(card_type.name)
+    PRICES.append(card_type.price.amount)
+    FACTION_MASKS.append(faction_mask(card_type.factions))
+    HEALTH.append(card_type.health)
+    BASES.append(card_type.card_type == CardType.BASE)
+    OUTPOSTS.append(card_type.outpost)
+    return card_type
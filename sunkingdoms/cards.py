@@ -6,14 +6,16 @@ from eventtree import replaceevent as rev
 from eventtree.replaceevent import StaticAttributeModification
 from gameframe.events import GameEvent
 from gameframe.interface import Option
-from sunkingdoms.artifacts.artifacts import Card, Price, Cardboard, Actions, Action, Faction
+from sunkingdoms.artifacts.artifacts import Card, Price, Cardboard, Action, Faction
 from sunkingdoms.artifacts.base import Base
+from sunkingdoms import carddb
 from sunkingdoms import events as e
 from sunkingdoms.players.player import SKPlayer
 from yeetlong.multiset import Multiset
 
 
 class AllyAction(Action):
+    __slots__ = ('_faction', '_result', '_requirement')
 
     def __init__(self, text: str, faction: Faction, result: t.Callable[[e.ActivateAction], None], requirement: int = 1):
         super().__init__(text)
@@ -21,6 +23,14 @@ class AllyAction(Action):
         self._result = result
         self._requirement = requirement + 1
 
+    @property
+    def faction(self) -> Faction:
+        return self._faction
+
+    @property
+    def requirement(self) -> int:
+        return self._requirement
+
     def requirements_fulfilled(self, event: e.SKGameEvent) -> bool:
         return event.player.allegiance[self._faction] >= self._requirement
 
@@ -29,6 +39,7 @@ class AllyAction(Action):
 
 
 class FreeAction(Action):
+    __slots__ = ('_result',)
 
     def __init__(self, text: str, result: t.Callable[[e.ActivateAction], None]):
         super().__init__(text)
@@ -42,6 +53,7 @@ class FreeAction(Action):
 
 
 class ScrapAction(Action):
+    __slots__ = ('_result',)
 
     def __init__(self, text: str, result: t.Callable[[e.ActivateAction], None]):
         super().__init__(text)
@@ -57,7 +69,10 @@ class ScrapAction(Action):
         self._result(event)
 
 
+@carddb.register
 class Scout(Card):
+    __slots__ = ()
+
     name = 'Scout'
     price = Price(0)
 
@@ -65,7 +80,10 @@ class Scout(Card):
         event.spawn_tree(e.AddMoney, amount = 1)
 
 
+@carddb.register
 class Viper(Card):
+    __slots__ = ()
+
     name = 'viper'
     price = Price(0)
 
@@ -73,21 +91,22 @@ class Viper(Card):
         event.spawn_tree(e.AddDamage, amount = 1)
 
 
+@carddb.register
 class FederationShuttle(Card):
+    __slots__ = ()
+
     name = 'Federation Shuttle'
     price = Price(1)
     factions = frozenset((Faction.BLUE, ))
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                AllyAction(
-                    'Gain 4 influence',
-                    Faction.BLUE,
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            AllyAction(
+                'Gain 4 influence',
+                Faction.BLUE,
+                cls._action,
+            ),
         )
 
     def on_play(self, event: GameEvent):
@@ -98,21 +117,22 @@ class FederationShuttle(Card):
         event.spawn_tree(e.GainInfluence, amount = 4)
 
 
+@carddb.register
 class Cutter(Card):
+    __slots__ = ()
+
     name = 'Cutter'
     price = Price(2)
     factions = frozenset((Faction.BLUE, ))
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                AllyAction(
-                    'Gain 4 damage',
-                    Faction.BLUE,
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            AllyAction(
+                'Gain 4 damage',
+                Faction.BLUE,
+                cls._action,
+            ),
         )
 
     def on_play(self, event: GameEvent):
@@ -132,21 +152,22 @@ class TopdeckNextShipBought(rev.ContinuousDelayedReplacement):
         event.replace_clone(to=event.player.library)
 
 
+@carddb.register
 class Freighter(Card):
+    __slots__ = ()
+
     name = 'Freighter'
     price = Price(4)
     factions = frozenset((Faction.BLUE, ))
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                AllyAction(
-                    'Topdeck next ship',
-                    Faction.BLUE,
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            AllyAction(
+                'Topdeck next ship',
+                Faction.BLUE,
+                cls._action,
+            ),
         )
 
     def on_play(self, event: GameEvent):
@@ -157,21 +178,22 @@ class Freighter(Card):
         event.game.create_condition(TopdeckNextShipBought)
 
 
+@carddb.register
 class TradePod(Card):
+    __slots__ = ()
+
     name = 'Trade Pod'
     price = Price(2)
     factions = frozenset((Faction.GREEN, ))
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                AllyAction(
-                    'Add 2 damage',
-                    Faction.GREEN,
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            AllyAction(
+                'Add 2 damage',
+                Faction.GREEN,
+                cls._action,
+            ),
         )
 
     def on_play(self, event: GameEvent):
@@ -182,21 +204,22 @@ class TradePod(Card):
         event.spawn_tree(e.AddDamage, amount = 2)
 
 
+@carddb.register
 class BlobFighter(Card):
+    __slots__ = ()
+
     name = 'BlobFighter'
     price = Price(1)
     factions = frozenset((Faction.GREEN, ))
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                AllyAction(
-                    'Draw 1 card',
-                    Faction.GREEN,
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            AllyAction(
+                'Draw 1 card',
+                Faction.GREEN,
+                cls._action,
+            ),
         )
 
     def on_play(self, event: GameEvent):
@@ -207,22 +230,23 @@ class BlobFighter(Card):
         event.spawn_tree(e.DrawCardboards, amount = 1)
 
 
+@carddb.register
 class WarningBeacon(Base):
+    __slots__ = ()
+
     name = 'Warning Beacon'
     price = Price(3)
     factions = frozenset((Faction.RED,))
     health = 3
     outpost = True
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                ScrapAction(
-                    'scrap: 5 damage',
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            ScrapAction(
+                'scrap: 5 damage',
+                cls._action,
+            ),
         )
 
     @classmethod
@@ -230,22 +254,23 @@ class WarningBeacon(Base):
         event.spawn_tree(e.AddDamage, amount = 5)
 
 
+@carddb.register
 class RecyclingStation(Base):
+    __slots__ = ()
+
     name = 'Recycling Station'
-    price = 4
+    price = Price(4)
     factions = frozenset((Faction.YELLOW,))
     health = 4
     outpost = True
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
-        self._actions = Actions(
-            (
-                FreeAction(
-                    'Gain 1 money or loot 2',
-                    self._action,
-                ),
-            )
+    @classmethod
+    def create_actions(cls) -> t.Iterable[Action]:
+        return (
+            FreeAction(
+                'Gain 1 money or loot 2',
+                cls._action,
+            ),
         )
 
     @classmethod
@@ -282,15 +307,17 @@ class RecyclingStation(Base):
             event.spawn_tree(e.DrawCardboards, amount = len(cardboards))
 
 
+@carddb.register
 class MechWorld(Base):
+    __slots__ = ()
+
     name = 'Mech World'
-    price = 5
+    price = Price(5)
     factions = frozenset((Faction.RED,))
     health = 6
     outpost = True
 
-    def __init__(self, cardboard: Cardboard, event: GameEvent):
-        super().__init__(cardboard, event)
+    def enter_play(self, event: t.Optional[GameEvent]):
         self._cardboard.create_condition(
             self.FactionBonus,
             event,
@@ -305,3 +332,14 @@ class MechWorld(Base):
 
         def resolve(self, owner: SKPlayer, value: Multiset[Faction]) -> Multiset[Faction]:
             return value + (set(Faction.__iter__()) - self.source.card.factions)
+
+
+TRADE_DECK: t.Tuple[t.Tuple[t.Type[Card], int], ...] = (
+    (FederationShuttle, 10),
+    (Cutter, 10),
+)
+
+STARTING_DECK: t.Tuple[t.Tuple[t.Type[Card], int], ...] = (
+    (MechWorld, 5),
+    (BlobFighter, 5),
+)
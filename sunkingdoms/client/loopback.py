@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+from gameframe.interface import Option
+
+from sunkingdoms.client.protocol import ServerConnection, ProtocolError, decode_option
+from sunkingdoms.server.server import GameServer
+from sunkingdoms.simulation.policies import Policy
+from sunkingdoms.simulation.runner import create_signatures
+
+
+def _index(options: t.Sequence[Option], choice: Option) -> int:
+    for index, option in enumerate(options):
+        if option is choice:
+            return index
+    raise ValueError('{} is not one of the offered options'.format(choice))
+
+
+class PolicyClient(object):
+
+    def __init__(self, name: str, policy: Policy):
+        self._name = name
+        self._policy = policy
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def _choose(self, message: t.Mapping[str, t.Any]) -> t.List[int]:
+        options = [decode_option(option) for option in message['options']]
+        if message['type'] == 'select_options':
+            return [
+                _index(options, choice)
+                for choice in
+                self._policy.select_options(None, options, message['minimum'], message['maximum'])
+            ]
+        return [_index(options, self._policy.select_option(None, options))]
+
+    async def play(self, host: str, port: int, table: t.Optional[str] = None) -> t.Optional[str]:
+        connection = await ServerConnection.connect(host, port)
+        try:
+            await connection.join(self._name, table)
+            async for message in connection:
+                if message['type'] in ('select_option', 'select_options', 'select_string'):
+                    await connection.choose(message['request'], self._choose(message))
+                elif message['type'] in ('timeout', 'delta', 'snapshot'):
+                    continue
+                elif message['type'] == 'finished':
+                    return message['winner']
+                elif message['type'] == 'aborted':
+                    return None
+                elif message['type'] == 'error':
+                    raise ProtocolError(message['message'])
+            raise ConnectionError('server closed the connection during the game')
+        finally:
+            await connection.close()
+
+
+async def play_loopback(
+    policies: t.Sequence[Policy],
+    seed: t.Optional[int] = None,
+    table: str = 'loopback',
+) -> t.Optional[str]:
+    async with GameServer(player_count = len(policies), seed = seed) as server:
+        host, port = server.address
+        winners = await asyncio.gather(
+            *(
+                PolicyClient(signature.name, policy).play(host, port, table)
+                for signature, policy in
+                zip(create_signatures(len(policies)), policies)
+            )
+        )
+    return winners[0]
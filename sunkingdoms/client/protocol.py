@@ -1,6 +1,94 @@
+from __future__ import annotations
 
+import asyncio
+import json
+import typing as t
 
+from gameframe.interface import Option
 
 
-class ServerConnection(object):
-    pass
\ No newline at end of file
+Message = t.Dict[str, t.Any]
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_message(message: t.Mapping[str, t.Any]) -> bytes:
+    return json.dumps(message, separators = (',', ':')).encode('utf-8') + b'\n'
+
+
+def decode_message(line: bytes) -> Message:
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise ProtocolError('malformed message: {!r}'.format(line)) from e
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ProtocolError('message without type: {!r}'.format(line))
+    return message
+
+
+def encode_option(option: Option) -> Message:
+    return {'type': option.option_type, 'value': option.value}
+
+
+def decode_option(message: t.Mapping[str, t.Any]) -> Option:
+    return Option(message['type'], message['value'])
+
+
+class MessageStream(object):
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+
+    async def send(self, message: t.Mapping[str, t.Any]) -> None:
+        async with self._write_lock:
+            self._writer.write(encode_message(message))
+            await self._writer.drain()
+
+    async def receive(self) -> Message:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError('connection closed')
+        return decode_message(line)
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def __aiter__(self) -> MessageStream:
+        return self
+
+    async def __anext__(self) -> Message:
+        try:
+            return await self.receive()
+        except ConnectionError:
+            raise StopAsyncIteration()
+
+
+class ServerConnection(MessageStream):
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> ServerConnection:
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def join(self, name: str, table: t.Optional[str] = None) -> Message:
+        await self.send({'type': 'join', 'name': name, 'table': table})
+        message = await self.receive()
+        if message['type'] == 'error':
+            raise ProtocolError(message['message'])
+        if message['type'] != 'joined':
+            raise ProtocolError('expected joined, got {}'.format(message['type']))
+        return message
+
+    async def choose(self, request: int, indices: t.Sequence[int]) -> None:
+        await self.send({'type': 'choice', 'request': request, 'indices': list(indices)})
+
+    async def resync(self) -> None:
+        await self.send({'type': 'resync'})
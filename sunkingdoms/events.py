@@ -1,18 +1,27 @@
+import itertools
 import typing as t
 
 from abc import abstractmethod
+from enum import Enum
 
 from eventtree.replaceevent import EventCheckException, EventResolutionException
 from gameframe.events import GameEvent
 from gameframe.interface import Option
 from sunkingdoms.artifacts.artifacts import Card, Cardboard, CardType, Action
-from sunkingdoms import cards
+from sunkingdoms import carddb, cards
 from sunkingdoms.attack import Target
 from sunkingdoms.game.interface import SKGame
 from sunkingdoms.players.interface import SKPlayer
 from sunkingdoms.setup import SKSetup
 from sunkingdoms.zones import Zone
 
+if t.TYPE_CHECKING:
+    from sunkingdoms.serialization import DecodedEvent
+
+
+HAND_SIZE = 5
+TRADE_ROW_SIZE = 5
+
 
 class SKGameEvent(GameEvent):
     player: SKPlayer
@@ -25,11 +34,32 @@ class SKGameEvent(GameEvent):
     def payload(self, **kwargs):
         pass
 
-    def serialize(self) -> t.Any:
-        pass
+    def _resolve_fast(self, event_type: t.Type[GameEvent], kwargs: t.Mapping[str, t.Any]) -> bool:
+        if (
+            issubclass(event_type, ResourceEvent)
+            and self.game.fast_events
+            and not self.game.has_listeners(event_type.__name__)
+        ):
+            self.game.condition_index.skip(event_type.__name__)
+            event_type.apply(**dict(self.values, **kwargs))
+            return True
+        return False
 
-    def deserialize(self, s: t.Any) -> GameEvent:
-        pass
+    def spawn_tree(self, event_type: t.Type[GameEvent], **kwargs) -> t.Any:
+        if self._resolve_fast(event_type, kwargs):
+            return None
+        return super().spawn_tree(event_type, **kwargs)
+
+    def depend_tree(self, event_type: t.Type[GameEvent], **kwargs) -> t.Any:
+        if self._resolve_fast(event_type, kwargs):
+            return None
+        return super().depend_tree(event_type, **kwargs)
+
+    def serialize(self) -> bytes:
+        return self.game.codec.encode(self)
+
+    def deserialize(self, s: bytes) -> 'DecodedEvent':
+        return self.game.codec.decode(s)
 
 
 class CreateCardboard(SKGameEvent):
@@ -64,35 +94,56 @@ class MoveCardboard(SKGameEvent):
             raise EventCheckException()
 
     def payload(self, **kwargs):
-        self.to.join(self.target)
+        self.to.join(self.target, self.index)
         if self.frm.name == 'battlefield':
             self.target.card.actions.refresh()
+            self.game.disconnect_sourced(self.target, parent = self)
         return self.target
+
+
+class MoveCardboards(SKGameEvent):
+    targets: t.Sequence[Cardboard]
+    frm: Zone
+    to: Zone
+    index: int
+
+    def setup(self, **kwargs):
+        self._values.setdefault('index', None)
+
+    def payload(self, **kwargs):
+        if self.game.has_listeners(MoveCardboard.__name__):
+            moved = []
+            for target in self.targets:
+                cardboard = self.spawn_tree(
+                    MoveCardboard,
+                    target = target,
+                    index = None if self.index is None else self.index + len(moved),
+                )
+                if cardboard is not None:
+                    moved.append(cardboard)
+            return moved
+
+        targets = [target for target in self.targets if target in self.frm]
+        self.to.join_many(targets, self.index)
+        if self.frm.name == 'battlefield':
+            for target in targets:
+                target.card.actions.refresh()
+                self.game.disconnect_sourced(target, parent = self)
+        return targets
     
     
 class Reshuffle(SKGameEvent):
 
     def payload(self, **kwargs):
-        if self.player.library:
-            index = len(self.player.discard_pile)
-            for cardboard in self.player.discard_pile:
-                self.spawn_tree(
-                    MoveCardboard,
-                    frm=self.player.discard_pile,
-                    to=self.player.library,
-                    target=cardboard,
-                    index = 0,
-                )
-            self.spawn_tree(ShuffleZone, to = self.player.library, index = index)
-        else:
-            for cardboard in tuple(self.player.discard_pile):
-                self.spawn_tree(
-                    MoveCardboard,
-                    frm = self.player.discard_pile,
-                    to = self.player.library,
-                    target = cardboard,
-                )
-            self.spawn_tree(ShuffleZone, to = self.player.library)
+        index = len(self.player.discard_pile) if self.player.library else None
+        self.spawn_tree(
+            MoveCardboards,
+            targets = tuple(self.player.discard_pile),
+            frm = self.player.discard_pile,
+            to = self.player.library,
+            index = None if index is None else 0,
+        )
+        self.spawn_tree(ShuffleZone, to = self.player.library, index = index)
     
     
 class DrawCardboard(SKGameEvent):
@@ -127,7 +178,7 @@ class DrawHand(SKGameEvent):
     amount: int
 
     def setup(self, **kwargs):
-        self._values.setdefault('amount', 5)
+        self._values.setdefault('amount', HAND_SIZE)
 
     def payload(self, **kwargs):
         return self.depend_tree(DrawCardboards)
@@ -149,59 +200,97 @@ class RefillTradeRow(SKGameEvent):
 
 class ShuffleZone(SKGameEvent):
     to: Zone
+    index: int
+
+    def setup(self, **kwargs):
+        self._values.setdefault('index', None)
 
     def payload(self, **kwargs):
-        self.to.shuffle()
+        self.to.shuffle(self.index)
 
 
 class SetupGame(SKGameEvent):
     setup_info: SKSetup
 
     def payload(self, **kwargs):
-        for _ in range(10):
-            self.spawn_tree(
-                CreateCardboard,
-                card_type = cards.FederationShuttle,
-                to = self.game.trade_deck,
-            )
-        for _ in range(10):
-            self.spawn_tree(
-                CreateCardboard,
-                card_type = cards.Cutter,
-                to = self.game.trade_deck,
-            )
+        for card_type, amount in cards.TRADE_DECK:
+            for _ in range(amount):
+                self.spawn_tree(
+                    CreateCardboard,
+                    card_type = card_type,
+                    to = self.game.trade_deck,
+                )
 
         self.spawn_tree(ShuffleZone, to = self.game.trade_deck)
 
-        for _ in range(5):
+        for _ in range(TRADE_ROW_SIZE):
             self.spawn_tree(RefillTradeRow)
 
         for player in self.game.players.all:
-            for _ in range(5):
-                self.spawn_tree(
-                    CreateCardboard,
-                    card_type = cards.MechWorld,
-                    to = player.discard_pile,
-                )
-            for _ in range(5):
-                self.spawn_tree(
-                    CreateCardboard,
-                    card_type = cards.BlobFighter,
-                    to = player.discard_pile,
-                )
+            for card_type, amount in cards.STARTING_DECK:
+                for _ in range(amount):
+                    self.spawn_tree(
+                        CreateCardboard,
+                        card_type = card_type,
+                        to = player.discard_pile,
+                    )
 
         for player in self.game.players.all:
             self.spawn_tree(DrawHand, player = player)
 
 
+class MoveKind(Enum):
+    PLAY = 'play card'
+    BUY = 'buy card'
+    ACTIVATE = 'activate cardboard'
+    ATTACK = 'attack'
+    PASS = 'pass turn'
+
+
 class Move(Option):
+    __slots__ = ('_kind', '_target', '_action')
+
+    def __init__(self, kind: MoveKind, target: t.Optional[Target] = None, action: t.Optional[Action] = None):
+        super().__init__(
+            kind.value,
+            kind.value if target is None else (
+                target.card.name if isinstance(target, Cardboard) else target.signature.name
+            ),
+            item = target,
+        )
+        self._kind = kind
+        self._target = target
+        self._action = action
 
-    def __init__(self, option_type: str, value: str, callback: t.Callable[[], None]):
-        super().__init__(option_type, value)
-        self._callback = callback
+    @property
+    def kind(self) -> MoveKind:
+        return self._kind
 
-    def do(self) -> None:
-        self._callback()
+    @property
+    def target(self) -> t.Optional[Target]:
+        return self._target
+
+    @property
+    def action(self) -> t.Optional[Action]:
+        return self._action
+
+    @property
+    def key(self) -> t.Tuple[MoveKind, t.Optional[Target], t.Optional[Action]]:
+        return self._kind, self._target, self._action
+
+    def do(self, event: TakeTurn) -> None:
+        if self._kind == MoveKind.PLAY:
+            event.spawn_tree(CastCardboard, target = self._target)
+        elif self._kind == MoveKind.BUY:
+            event.spawn_tree(BuyCardboard, target = self._target)
+        elif self._kind == MoveKind.ACTIVATE:
+            event.spawn_tree(ActivateAction, target = self._target, action = self._action)
+        elif self._kind == MoveKind.ATTACK:
+            event.spawn_tree(
+                Attack,
+                target = self._target,
+                amount = self._target.card.health if isinstance(self._target, Cardboard) else event.player.damage,
+            )
 
 
 class CastCardboard(SKGameEvent):
@@ -215,6 +304,7 @@ class CastCardboard(SKGameEvent):
 
     def payload(self, **kwargs):
         self.depend_tree(MoveCardboard)
+        self.target.card.enter_play(self)
         self.target.card.on_play(self)
 
 
@@ -265,18 +355,34 @@ class Attack(SKGameEvent):
         self.target.attack(self.amount, self)
 
 
-class AddMoney(SKGameEvent):
+class ResourceEvent(SKGameEvent):
+
+    @classmethod
+    @abstractmethod
+    def apply(cls, player: SKPlayer, **kwargs) -> None:
+        pass
+
+
+class AddMoney(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.money += amount
+
     def payload(self, **kwargs):
-        self.player.money += self.amount
+        self.apply(self.player, self.amount)
 
 
-class SubtractMoney(SKGameEvent):
+class SubtractMoney(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.money -= amount
+
     def payload(self, **kwargs):
-        self.player.money -= self.amount
+        self.apply(self.player, self.amount)
 
 
 class PayMoney(SKGameEvent):
@@ -300,30 +406,42 @@ class BuyCardboard(SKGameEvent):
         self._values.setdefault('to', self.player.discard_pile)
 
     def payload(self, **kwargs):
-        self.depend_tree(PayMoney, amount = self.target.card.price.amount)
+        self.depend_tree(PayMoney, amount = carddb.price(self.target.card))
         self.spawn_tree(MoveCardboard)
         self.branch(RefillTradeRow, player = self.player)
 
 
-class AddDamage(SKGameEvent):
+class AddDamage(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.damage += amount
+
     def payload(self, **kwargs):
-        self.player.damage += self.amount
+        self.apply(self.player, self.amount)
 
 
-class SubtractDamage(SKGameEvent):
+class SubtractDamage(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.damage -= amount
+
     def payload(self, **kwargs):
-        self.player.damage -= self.amount
+        self.apply(self.player, self.amount)
 
 
-class ResetResources(SKGameEvent):
+class ResetResources(ResourceEvent):
+
+    @classmethod
+    def apply(cls, player: SKPlayer, **kwargs) -> None:
+        player.money = 0
+        player.damage = 0
 
     def payload(self, **kwargs):
-        self.player.money = 0
-        self.player.damage = 0
+        self.apply(self.player)
 
 
 class ActivateAction(SKGameEvent):
@@ -333,126 +451,190 @@ class ActivateAction(SKGameEvent):
     def payload(self, **kwargs):
         self.action.cost(self)
         self.action.do(self)
-        self.action.exhaust()
+        self.target.card.actions.exhaust(self.action)
 
 
-class GainInfluence(SKGameEvent):
+class GainInfluence(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.influence += amount
+
     def payload(self, **kwargs):
-        self.player.influence += self.amount
+        self.apply(self.player, self.amount)
 
 
-class LoseInfluence(SKGameEvent):
+class LoseInfluence(ResourceEvent):
     amount: int
 
+    @classmethod
+    def apply(cls, player: SKPlayer, amount: int, **kwargs) -> None:
+        player.influence -= amount
+
     def payload(self, **kwargs):
-        self.player.influence -= self.amount
+        self.apply(self.player, self.amount)
 
 
 class TakeTurn(SKGameEvent):
 
-    def _play_cardboard_action(self, cardboard: Cardboard) -> Move:
-        return Move(
-            'play card',
-            cardboard.card.name,
-            lambda : self.spawn_tree(
-                CastCardboard,
-                target = cardboard,
-            )
-        )
-
-    def _buy_cardboard_action(self, cardboard: Cardboard) -> Move:
-        return Move(
-            'buy card',
-            cardboard.card.name,
-            lambda : self.spawn_tree(
-                BuyCardboard,
-                target = cardboard,
-            )
-        )
+    def take_actions(self) -> None:
+        legal_moves = LegalMoves(self)
+        pass_turn = Move(MoveKind.PASS)
 
-    def _activate_cardboard_action(self, cardboard: Cardboard, action: Action):
-        return Move(
-            'activate cardboard',
-            cardboard.card.name,
-            lambda : self.spawn_tree(
-                ActivateAction,
-                target = cardboard,
-                action = action,
-            )
-        )
-
-    def _attack_action(self, target: Target):
-        return Move(
-            'attack',
-            target.card.name if isinstance(target, Cardboard) else target.signature.name,
-            lambda : self.spawn_tree(
-                Attack,
-                target = target,
-                amount = target.card.health if isinstance(target, Cardboard) else self.player.damage,
-            )
-        )
-
-    def payload(self, **kwargs):
         while True:
-            moves: t.List[Move] = []
-            for cardboard in self.player.hand:
-                moves.append(self._play_cardboard_action(cardboard))
-
-            for cardboard in self.game.trade_row:
-                if cardboard.card.price.amount <= self.player.money:
-                    moves.append(
-                        self._buy_cardboard_action(cardboard)
-                    )
-
-            for cardboard in self.player.battlefield:
-                for action in cardboard.card.actions:
-                    if action.available(self):
-                        moves.append(
-                            self._activate_cardboard_action(
-                                cardboard,
-                                action,
-                            )
-                        )
-
-            if self.player.damage:
-                for target in self.player.opponent.get_legal_targets(self.player.damage):
-                    moves.append(
-                        self._attack_action(
-                            target
-                        )
-                    )
+            moves = legal_moves.moves
 
             if not moves:
                 break
 
-            pass_turn = Move('pass turn', 'pass turn', lambda : None)
-
-            moves.append(pass_turn)
-
             move = self.game.interface.select_option(
                 self.player,
-                moves,
+                moves + (pass_turn,),
             )
 
             if move == pass_turn:
                 break
 
-            move.do()
+            move.do(self)
 
-        for cardboard in self.player.battlefield.iter_copy():
-            if not cardboard.card.card_type == CardType.BASE:
-                self.spawn_tree(DestroyCardboard, target = cardboard)
-            else:
-                cardboard.card.actions.refresh()
+    def end_turn(self) -> None:
+        if any(self.game.has_listeners(trigger) for trigger in _CLEANUP_TRIGGERS):
+            for cardboard in self.player.battlefield.iter_copy():
+                if not cardboard.card.card_type == CardType.BASE:
+                    self.spawn_tree(DestroyCardboard, target = cardboard)
+                else:
+                    cardboard.card.actions.refresh()
 
-        for cardboard in self.player.hand.iter_copy():
-            self.spawn_tree(DiscardCardboard, target = cardboard)
+            for cardboard in self.player.hand.iter_copy():
+                self.spawn_tree(DiscardCardboard, target = cardboard)
+
+        else:
+            ships = []
+            for cardboard in self.player.battlefield:
+                if not cardboard.card.card_type == CardType.BASE:
+                    ships.append(cardboard)
+                else:
+                    cardboard.card.actions.refresh()
+
+            self.spawn_tree(
+                MoveCardboards,
+                targets = ships,
+                frm = self.player.battlefield,
+                to = self.player.discard_pile,
+            )
+            self.spawn_tree(
+                MoveCardboards,
+                targets = tuple(self.player.hand),
+                frm = self.player.hand,
+                to = self.player.discard_pile,
+            )
 
         self.spawn_tree(ResetResources)
         self.spawn_tree(DrawHand)
 
+    def payload(self, **kwargs):
+        previous, self.game.turn = self.game.turn, self
+        try:
+            self.take_actions()
+            self.end_turn()
+        finally:
+            self.game.turn = previous
+
+
+_CLEANUP_TRIGGERS = ('DestroyCardboard', 'DiscardCardboard', 'MoveCardboard')
+
+
+class LegalMoves(object):
+
+    def __init__(self, event: TakeTurn):
+        self._event = event
+        self._segments = (
+            (self._play_key, self._play_moves),
+            (self._buy_key, self._buy_moves),
+            (self._activate_key, self._activate_moves),
+            (self._attack_key, self._attack_moves),
+        )
+        self._keys: t.List[t.Any] = [None] * len(self._segments)
+        self._segment_moves: t.List[t.Tuple[Move, ...]] = [()] * len(self._segments)
+        self._moves: t.Tuple[Move, ...] = ()
+        self._cache: t.Dict[t.Tuple[MoveKind, Target, t.Optional[Action]], Move] = {}
+
+    def _move(self, kind: MoveKind, target: Target, action: t.Optional[Action] = None) -> Move:
+        try:
+            return self._cache[kind, target, action]
+        except KeyError:
+            move = self._cache[kind, target, action] = Move(kind, target, action)
+            return move
+
+    def _play_key(self) -> t.Any:
+        return self._event.player.hand.version
+
+    def _play_moves(self) -> t.Tuple[Move, ...]:
+        return tuple(
+            self._move(MoveKind.PLAY, cardboard)
+            for cardboard in
+            self._event.player.hand
+        )
+
+    def _buy_key(self) -> t.Any:
+        return self._event.game.trade_row.version, self._event.player.money
+
+    def _buy_moves(self) -> t.Tuple[Move, ...]:
+        money = self._event.player.money
+        return tuple(
+            self._move(MoveKind.BUY, cardboard)
+            for cardboard in
+            self._event.game.trade_row
+            if carddb.price(cardboard.card) <= money
+        )
+
+    def _activate_key(self) -> t.Any:
+        return (
+            self._event.player.battlefield.version,
+            self._event.game.trigger_version('allegiance'),
+            tuple(
+                cardboard.card.actions.exhausted
+                for cardboard in
+                self._event.player.battlefield
+            ),
+        )
+
+    def _activate_moves(self) -> t.Tuple[Move, ...]:
+        return tuple(
+            self._move(MoveKind.ACTIVATE, cardboard, action)
+            for cardboard in
+            self._event.player.battlefield
+            for action in
+            cardboard.card.actions
+            if cardboard.card.actions.available(action, self._event)
+        )
+
+    def _attack_key(self) -> t.Any:
+        return self._event.player.opponent.battlefield.version, self._event.player.damage
+
+    def _attack_moves(self) -> t.Tuple[Move, ...]:
+        if not self._event.player.damage:
+            return ()
+        return tuple(
+            self._move(MoveKind.ATTACK, target)
+            for target in
+            self._event.player.opponent.get_legal_targets(self._event.player.damage)
+        )
+
+    @property
+    def moves(self) -> t.Tuple[Move, ...]:
+        changed = False
+        for index, (key, moves) in enumerate(self._segments):
+            _key = key()
+            if _key != self._keys[index]:
+                self._keys[index] = _key
+                self._segment_moves[index] = moves()
+                changed = True
+        if changed:
+            self._moves = tuple(itertools.chain.from_iterable(self._segment_moves))
+        return self._moves
+
 
 class GameFinished(SKGameEvent):
     winner: SKPlayer
@@ -461,21 +643,22 @@ class GameFinished(SKGameEvent):
         pass
 
 
+def find_winner(game: SKGame) -> t.Optional[SKPlayer]:
+    for player in game.players.all:
+        if player.influence <= 0:
+            return game.players.loop_from(player).__next__()
+
+
 class PlayGame(SKGameEvent):
     setup_info: SKSetup
 
-    def _check_game_end(self) -> t.Optional[SKPlayer]:
-        for player in self.game.players.all:
-            if player.influence <= 0:
-                return self.game.players.loop_from(player).__next__()
-
     def payload(self, **kwargs):
         self.spawn_tree(SetupGame)
 
         while True:
             player = self.game.players.next()
             self.spawn_tree(TakeTurn, player = player)
-            winner = self._check_game_end()
+            winner = find_winner(self.game)
             if winner:
                 self.spawn_tree(GameFinished, winner = winner)
                 break
\ No newline at end of file
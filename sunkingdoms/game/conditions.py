@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import typing as t
+
+from collections import defaultdict
+
+from eventtree.replaceevent import Condition
+
+from sunkingdoms.game.snapshot import ConditionSpec
+
+
+class ConditionIndex(object):
+
+    def __init__(self):
+        self._specs: t.Dict[Condition, ConditionSpec] = {}
+        self._listeners: t.Dict[str, t.Set[Condition]] = {}
+        self._versions: t.DefaultDict[str, int] = defaultdict(int)
+        self._skipped: t.DefaultDict[str, int] = defaultdict(int)
+
+    @classmethod
+    def triggers(cls, condition_type: t.Type[Condition]) -> t.FrozenSet[str]:
+        return frozenset(
+            trigger
+            for trigger in
+            (condition_type.trigger, getattr(condition_type, 'terminate_trigger', None))
+            if trigger is not None
+        )
+
+    def add(self, condition: Condition, spec: ConditionSpec) -> None:
+        self._specs[condition] = spec
+        self._versions[condition.trigger] += 1
+        for trigger in self.triggers(type(condition)):
+            self._listeners.setdefault(trigger, set()).add(condition)
+
+    def remove(self, condition: Condition) -> t.Optional[ConditionSpec]:
+        self._versions[condition.trigger] += 1
+        spec = self._specs.pop(condition, None)
+        if spec is not None:
+            for trigger in self.triggers(type(condition)):
+                listeners = self._listeners[trigger]
+                listeners.discard(condition)
+                if not listeners:
+                    del self._listeners[trigger]
+        return spec
+
+    def version(self, trigger: str) -> int:
+        return self._versions[trigger]
+
+    def has_listeners(self, trigger: str) -> bool:
+        return trigger in self._listeners
+
+    def listeners(self, trigger: str) -> t.AbstractSet[Condition]:
+        return self._listeners.get(trigger, frozenset())
+
+    def skip(self, trigger: str) -> None:
+        self._skipped[trigger] += 1
+
+    @property
+    def skipped(self) -> t.Mapping[str, int]:
+        return self._skipped
+
+    def sourced(self, source: t.Any) -> t.List[Condition]:
+        return [
+            condition
+            for condition, spec in
+            self._specs.items()
+            if spec.kwargs.get('source') is source
+        ]
+
+    def items(self) -> t.ItemsView[Condition, ConditionSpec]:
+        return self._specs.items()
+
+    @property
+    def specs(self) -> t.Tuple[ConditionSpec, ...]:
+        return tuple(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, condition: Condition) -> bool:
+        return condition in self._specs
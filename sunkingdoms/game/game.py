@@ -1,59 +1,240 @@
 from __future__ import annotations
 
+import itertools
+import random
 import typing as t
 
+from contextlib import contextmanager
+
 from ring import Ring
 
+from eventtree.replaceevent import Condition
+
 from gameframe.events import GameEvent
 from gameframe.interface import GameInterface
 
 from sunkingdoms.artifacts.artifacts import Cardboard
+from sunkingdoms.game.conditions import ConditionIndex
+from sunkingdoms.game.profiling import EventProfiler
+from sunkingdoms.game.snapshot import ConditionSpec, GameSnapshot, PlayerResources
 from sunkingdoms.players.player import SKPlayer
+from sunkingdoms.serialization import EventCodec
 from sunkingdoms.setup import SKSetup
 from sunkingdoms.signatures import SKPlayerSignature
-from sunkingdoms.zones import Zone
+from sunkingdoms.zones import Zone, IndexedZone
 from sunkingdoms.game.interface import SKGame as SKGameInterface
 
+if t.TYPE_CHECKING:
+    from sunkingdoms.events import TakeTurn
+
 
 class SKGame(SKGameInterface):
 
     def __init__(self, setup_info: SKSetup, interface: GameInterface, signatures: t.Collection[SKPlayerSignature]):
         super().__init__(setup_info, interface, signatures)
 
+        self._seed = setup_info.seed
+        self._random = random.Random(self._seed)
+        self._profiler: t.Optional[EventProfiler] = None
+        self._condition_index = ConditionIndex()
+        self._condition_serials = itertools.count()
+        self._fast_events = False
+        self._turn: t.Optional[TakeTurn] = None
+        self._codec: t.Optional[EventCodec] = None
+
+        self._cardboards: t.List[Cardboard] = []
+
         self._players = Ring(
-            SKPlayer(self, signature)
-            for signature in
-            signatures
+            SKPlayer(self, signature, player_id)
+            for player_id, signature in
+            enumerate(signatures)
         )
 
-        self._trade_deck = Zone(
+        self._trade_deck = IndexedZone(
             'trade deck',
             ordered = True,
             private = False,
             face_up = False,
+            rng = self._random,
         )
-        self._trade_row = Zone(
+        self._trade_row = IndexedZone(
             'trade row',
             ordered = False,
             private = False,
             face_up = True,
+            rng = self._random,
         )
-        self._scrap_pile = Zone(
+        self._scrap_pile = IndexedZone(
             'scrap',
             ordered = False,
             private = False,
             face_up = True,
+            rng = self._random,
         )
 
+        self._player_table = tuple(self._players.all)
+        self._zone_table = tuple(self.zones)
+        for zone_id, zone in enumerate(self._zone_table):
+            zone.id = zone_id
+
     @property
     def players(self) -> Ring[SKPlayer]:
         return self._players
 
+    @property
+    def seed(self) -> t.Optional[int]:
+        return self._seed
+
+    @property
+    def random(self) -> random.Random:
+        return self._random
+
+    @property
+    def profiler(self) -> t.Optional[EventProfiler]:
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: t.Optional[EventProfiler]) -> None:
+        self._profiler = profiler
+
+    @property
+    def fast_events(self) -> bool:
+        return self._fast_events
+
+    @fast_events.setter
+    def fast_events(self, fast_events: bool) -> None:
+        self._fast_events = fast_events
+
+    @property
+    def turn(self) -> t.Optional[TakeTurn]:
+        return self._turn
+
+    @turn.setter
+    def turn(self, turn: t.Optional[TakeTurn]) -> None:
+        self._turn = turn
+
+    @property
+    def cardboards(self) -> t.Sequence[Cardboard]:
+        return self._cardboards
+
+    def register_cardboard(self, cardboard: Cardboard) -> int:
+        self._cardboards.append(cardboard)
+        return len(self._cardboards) - 1
+
+    def cardboard(self, cardboard_id: int) -> Cardboard:
+        return self._cardboards[cardboard_id]
+
+    def zone(self, zone_id: int) -> Zone[Cardboard]:
+        return self._zone_table[zone_id]
+
+    def player(self, player_id: int) -> SKPlayer:
+        return self._player_table[player_id]
+
+    @property
+    def codec(self) -> EventCodec:
+        if self._codec is None:
+            self._codec = EventCodec(self)
+        return self._codec
+
+    @property
+    def condition_index(self) -> ConditionIndex:
+        return self._condition_index
+
+    def trigger_version(self, trigger: str) -> int:
+        return self._condition_index.version(trigger)
+
+    def has_listeners(self, trigger: str) -> bool:
+        return self._condition_index.has_listeners(trigger)
+
+    def _connect_condition(self, spec: ConditionSpec) -> Condition:
+        condition = super().create_condition(spec.condition_type, *spec.args, **spec.kwargs)
+        self._condition_index.add(condition, spec)
+        return condition
+
+    def create_condition(self, condition_type: t.Type[Condition], *args, **kwargs) -> Condition:
+        return self._connect_condition(
+            ConditionSpec(next(self._condition_serials), condition_type, args, kwargs)
+        )
+
+    def disconnect_condition(self, condition: Condition, *args, **kwargs) -> None:
+        super().disconnect_condition(condition, *args, **kwargs)
+        self._condition_index.remove(condition)
+
+    def disconnect_sourced(self, source: t.Any, parent: t.Optional[GameEvent]) -> None:
+        # Conditions a card connects in enter_play, like Mech World's allegiance bonus, leave play with it.
+        if self._condition_index:
+            for condition in self._condition_index.sourced(source):
+                self.disconnect_condition(condition, parent = parent)
+
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(
+            zones = tuple(
+                (zone, tuple(zone))
+                for zone in
+                self.zones
+            ),
+            resources = tuple(
+                PlayerResources(player, player.influence, player.money, player.damage)
+                for player in
+                self._players.all
+            ),
+            exhausted = tuple(
+                (cardboard, cardboard.card.actions.exhausted)
+                for player in
+                self._players.all
+                for cardboard in
+                player.battlefield
+                if cardboard.card.actions.exhausted
+            ),
+            conditions = self._condition_index.specs,
+            random_state = self._random.getstate(),
+            cardboards = len(self._cardboards),
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        for zone, cardboards in snapshot.zones:
+            zone.restore(cardboards)
+            for cardboard in cardboards:
+                cardboard.card.actions.refresh()
+
+        for cardboard, exhausted in snapshot.exhausted:
+            cardboard.card.actions.exhausted = exhausted
+
+        for resources in snapshot.resources:
+            resources.player.influence = resources.influence
+            resources.player.money = resources.money
+            resources.player.damage = resources.damage
+
+        serials = {spec.serial for spec in snapshot.conditions}
+        for condition, spec in list(self._condition_index.items()):
+            if spec.serial not in serials:
+                self.disconnect_condition(condition, parent = None)
+        active = {spec.serial for spec in self._condition_index.specs}
+        for spec in snapshot.conditions:
+            if spec.serial not in active:
+                self._connect_condition(spec)
+
+        self._random.setstate(snapshot.random_state)
+        del self._cardboards[snapshot.cardboards:]
+
+    @contextmanager
+    def detached(self, interface: GameInterface) -> t.Iterator[SKGame]:
+        previous_interface, previous_profiler = self._interface, self._profiler
+        self._interface, self._profiler = interface, None
+        try:
+            yield self
+        finally:
+            self._interface, self._profiler = previous_interface, previous_profiler
+
     def log_event(self, event: GameEvent) -> None:
+        if self._profiler is not None:
+            self._profiler.event_started(event)
         self._interface.notify_event_start(event)
 
     def event_finished(self, event: GameEvent, success: bool) -> None:
         self._interface.notify_event_end(event, success)
+        if self._profiler is not None:
+            self._profiler.event_finished(event, success)
 
     @property
     def trade_deck(self) -> Zone[Cardboard]:
@@ -67,5 +248,13 @@ class SKGame(SKGameInterface):
     def scrap_pile(self) -> Zone[Cardboard]:
         return self._scrap_pile
 
+    @property
+    def zones(self) -> t.Iterator[Zone[Cardboard]]:
+        yield self._trade_deck
+        yield self._trade_row
+        yield self._scrap_pile
+        for player in self._players.all:
+            yield from player.zones
+
     def start(self):
         pass
\ No newline at end of file
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import random
+
+import typing as t
+
 from abc import abstractmethod
 
 from ring import Ring
@@ -7,15 +11,34 @@ from ring import Ring
 from gameframe.game import Game
 
 from sunkingdoms.artifacts.artifacts import Cardboard
+from sunkingdoms.game.conditions import ConditionIndex
 from sunkingdoms.players.interface import SKPlayer
 from sunkingdoms.zones import Zone
 
+if t.TYPE_CHECKING:
+    from sunkingdoms.events import TakeTurn
+    from sunkingdoms.serialization import EventCodec
+
 
 class SKGame(Game):
     players: Ring[SKPlayer]
     trade_deck: Zone[Cardboard]
     trade_row: Zone[Cardboard]
     scrap_pile: Zone[Cardboard]
+    zones: t.Iterator[Zone[Cardboard]]
+    cardboards: t.Sequence[Cardboard]
+    register_cardboard: t.Callable[[Cardboard], int]
+    cardboard: t.Callable[[int], Cardboard]
+    zone: t.Callable[[int], Zone[Cardboard]]
+    player: t.Callable[[int], SKPlayer]
+    random: random.Random
+    trigger_version: t.Callable[[str], int]
+    has_listeners: t.Callable[[str], bool]
+    disconnect_sourced: t.Callable[..., None]
+    condition_index: ConditionIndex
+    fast_events: bool
+    turn: t.Optional[TakeTurn]
+    codec: EventCodec
 
     @abstractmethod
     def start(self):
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+import typing as t
+
+from collections import defaultdict
+
+from gameframe.events import GameEvent
+
+
+class EventStatistics(object):
+
+    def __init__(self):
+        self.count = 0
+        self.inclusive = 0.
+        self.exclusive = 0.
+        self.max_depth = 0
+
+    def merge(self, other: EventStatistics) -> None:
+        self.count += other.count
+        self.inclusive += other.inclusive
+        self.exclusive += other.exclusive
+        self.max_depth = max(self.max_depth, other.max_depth)
+
+
+class EventProfiler(object):
+
+    def __init__(self, clock: t.Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._stack: t.List[t.List[t.Any]] = []
+        self._statistics: t.DefaultDict[str, EventStatistics] = defaultdict(EventStatistics)
+        self._stacks: t.DefaultDict[t.Tuple[str, ...], float] = defaultdict(float)
+
+    @property
+    def statistics(self) -> t.Mapping[str, EventStatistics]:
+        return self._statistics
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack)
+
+    def event_started(self, event: GameEvent) -> None:
+        self._stack.append([event.__class__.__name__, self._clock(), 0.])
+
+    def event_finished(self, event: GameEvent, success: bool) -> None:
+        name, started, children = self._stack.pop()
+        elapsed = self._clock() - started
+
+        statistics = self._statistics[name]
+        statistics.count += 1
+        statistics.inclusive += elapsed
+        statistics.exclusive += elapsed - children
+        statistics.max_depth = max(statistics.max_depth, len(self._stack) + 1)
+
+        self._stacks[tuple(frame[0] for frame in self._stack) + (name,)] += elapsed - children
+
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def merge(self, other: EventProfiler) -> None:
+        for name, statistics in other._statistics.items():
+            self._statistics[name].merge(statistics)
+        for stack, elapsed in other._stacks.items():
+            self._stacks[stack] += elapsed
+
+    def abandon(self) -> None:
+        self._stack[:] = []
+
+    def reset(self) -> None:
+        self.abandon()
+        self._statistics.clear()
+        self._stacks.clear()
+
+    def report(self, limit: t.Optional[int] = None) -> str:
+        rows = sorted(
+            self._statistics.items(),
+            key = lambda item: item[1].exclusive,
+            reverse = True,
+        )[:limit]
+        name_width = max([len('event')] + [len(name) for name, _ in rows])
+        total = sum(statistics.exclusive for statistics in self._statistics.values()) or 1.
+
+        lines = [
+            '{} {:>10} {:>12} {:>12} {:>7} {:>6}'.format(
+                'event'.ljust(name_width),
+                'count',
+                'inclusive',
+                'exclusive',
+                'share',
+                'depth',
+            )
+        ]
+        for name, statistics in rows:
+            lines.append(
+                '{} {:>10} {:>12.6f} {:>12.6f} {:>6.1%} {:>6}'.format(
+                    name.ljust(name_width),
+                    statistics.count,
+                    statistics.inclusive,
+                    statistics.exclusive,
+                    statistics.exclusive / total,
+                    statistics.max_depth,
+                )
+            )
+        return '\n'.join(lines)
+
+    def collapsed_stacks(self) -> t.Iterator[str]:
+        for stack, elapsed in sorted(self._stacks.items()):
+            yield '{} {}'.format(';'.join(stack), int(elapsed * 1e6))
+
+    def write_collapsed_stacks(self, f: t.TextIO) -> None:
+        for line in self.collapsed_stacks():
+            f.write(line + '\n')
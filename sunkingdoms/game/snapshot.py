@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import typing as t
+
+from eventtree.replaceevent import Condition
+
+from sunkingdoms.artifacts.artifacts import Cardboard
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.zones import Zone
+
+
+class ConditionSpec(t.NamedTuple):
+    serial: int
+    condition_type: t.Type[Condition]
+    args: t.Tuple[t.Any, ...]
+    kwargs: t.Mapping[str, t.Any]
+
+
+class PlayerResources(t.NamedTuple):
+    player: SKPlayer
+    influence: int
+    money: int
+    damage: int
+
+
+class GameSnapshot(t.NamedTuple):
+    zones: t.Tuple[t.Tuple[Zone[Cardboard], t.Tuple[Cardboard, ...]], ...]
+    resources: t.Tuple[PlayerResources, ...]
+    exhausted: t.Tuple[t.Tuple[Cardboard, int], ...]
+    conditions: t.Tuple[ConditionSpec, ...]
+    random_state: t.Any
+    cardboards: int
@@ -2,6 +2,7 @@ import typing as t
 
 import copy
 import itertools
+import logging
 
 from collections import defaultdict, OrderedDict
 from enum import Enum
@@ -13,6 +14,7 @@ from gameframe.events import GameEvent
 from gameframe.interface import GameInterface, Option, O
 from gameframe.signature import ObserverSignature, PlayerSignature
 from sunkingdoms.artifacts.artifacts import Zone, Cardboard
+from sunkingdoms.zones import IndexedZone
 from sunkingdoms.events import TakeTurn
 from sunkingdoms.players.player import SKPlayer
 from yeetlong.multiset import Multiset
@@ -80,6 +82,7 @@ class _OptionSelectionContext(object):
 
 
 def count_zone(zone: Zone) -> str:
+    composition = zone.composition if isinstance(zone, IndexedZone) else Multiset(map(serialize_object, zone))
     return ', '.join(
         (
             (str(multiplicity) + 'x ')
@@ -88,9 +91,7 @@ def count_zone(zone: Zone) -> str:
         ) + name
         for name, multiplicity in
         sorted(
-            Multiset(
-                map(serialize_object, zone)
-            ).items(),
+            composition.items(),
             key = lambda vs: vs[0],
         )
     )
@@ -285,34 +286,26 @@ class SKDummyInterface(GameInterface):
 
         return selected
 
-    def serialize_event(self, event: Event, status: EventStatus):
-        if isinstance(event, GameEvent):
-            if status == self.EventStatus.START and isinstance(event, TakeTurn):
-                print('-' * 30 + 'Turn: ' + str(self._turn_counter) + '-' * 30)
-                self._turn_counter += 1
-            return '{}{}{} {}'.format(
-                self._running_events * '-|',
-                status.value,
-                event.__class__.__name__,
-                {
-                    key: serialize_object(value)
-                    for key, value in
-                    event.values.items()
-                    if key in event.fields
-                },
-            )
+    @classmethod
+    def format_event(cls, event: Event, status: EventStatus, depth: int) -> str:
         return '{}{}{} {}'.format(
-            self._running_events * '-|',
+            depth * '-|',
             status.value,
             event.__class__.__name__,
             {
                 key: serialize_object(value)
                 for key, value in
                 event.values.items()
-                if key in event.values
+                if not isinstance(event, GameEvent) or key in event.fields
             },
         )
 
+    def serialize_event(self, event: Event, status: EventStatus):
+        if status == self.EventStatus.START and isinstance(event, TakeTurn):
+            print('-' * 30 + 'Turn: ' + str(self._turn_counter) + '-' * 30)
+            self._turn_counter += 1
+        return self.format_event(event, status, self._running_events)
+
     def notify_event_start(self, event: GameEvent) -> None:
         print(self.serialize_event(event, self.EventStatus.START))
         self._running_events += 1
@@ -320,3 +313,62 @@ class SKDummyInterface(GameInterface):
     def notify_event_end(self, event: GameEvent, success: bool) -> None:
         self._running_events -= 1
         print(self.serialize_event(event, self.EventStatus.SUCCESS if success else self.EventStatus.FAIL))
+
+
+class SKQuietInterface(SKDummyInterface):
+
+    def notify_event_start(self, event: GameEvent) -> None:
+        pass
+
+    def notify_event_end(self, event: GameEvent, success: bool) -> None:
+        pass
+
+
+class _LazyEventFormat(object):
+
+    def __init__(self, event: Event, status: SKDummyInterface.EventStatus, depth: int):
+        self._event = event
+        self._status = status
+        self._depth = depth
+
+    def __str__(self) -> str:
+        return SKDummyInterface.format_event(self._event, self._status, self._depth)
+
+
+class SKLoggingInterface(SKDummyInterface):
+
+    def __init__(
+        self,
+        controller: ConnectionController,
+        logger: t.Optional[logging.Logger] = None,
+        level: int = logging.DEBUG,
+    ):
+        super().__init__(controller)
+        self._logger = logging.getLogger(__name__) if logger is None else logger
+        self._level = level
+
+    def notify_event_start(self, event: GameEvent) -> None:
+        if self._logger.isEnabledFor(self._level):
+            if isinstance(event, TakeTurn):
+                self._logger.log(self._level, 'Turn: %d', self._turn_counter)
+            self._logger.log(
+                self._level,
+                '%s',
+                _LazyEventFormat(event, self.EventStatus.START, self._running_events),
+            )
+        if isinstance(event, TakeTurn):
+            self._turn_counter += 1
+        self._running_events += 1
+
+    def notify_event_end(self, event: GameEvent, success: bool) -> None:
+        self._running_events -= 1
+        if self._logger.isEnabledFor(self._level):
+            self._logger.log(
+                self._level,
+                '%s',
+                _LazyEventFormat(
+                    event,
+                    self.EventStatus.SUCCESS if success else self.EventStatus.FAIL,
+                    self._running_events,
+                ),
+            )
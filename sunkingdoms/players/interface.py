@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import typing as t
 
 from abc import abstractmethod
@@ -11,13 +12,22 @@ from gameframe.events import GameEvent
 
 from sunkingdoms.attack import Target
 from sunkingdoms.artifacts.artifacts import Cardboard, Faction
-from sunkingdoms.zones import Zone, ZoneOwner
+from sunkingdoms.zones import Zone, IndexedZone, ZoneOwner
 
 
-class Battlefield(Zone[Cardboard]):
+class Battlefield(IndexedZone[Cardboard]):
+    __slots__ = ('_allegiance',)
 
-    def __init__(self, name: str, ordered: bool, private: bool, face_up: bool, owner: t.Optional[ZoneOwner] = None):
-        super().__init__(name, ordered, private, face_up, owner)
+    def __init__(
+        self,
+        name: str,
+        ordered: bool,
+        private: bool,
+        face_up: bool,
+        owner: t.Optional[ZoneOwner] = None,
+        rng: t.Optional[random.Random] = None,
+    ):
+        super().__init__(name, ordered, private, face_up, owner, rng)
         self._allegiance: Multiset[Faction] = Multiset()
 
     @property
@@ -32,6 +42,22 @@ class Battlefield(Zone[Cardboard]):
         super().join(cardboard, index)
         self._allegiance += cardboard.card.factions
 
+    def leave_many(self, cardboards: t.Collection[Cardboard]) -> None:
+        super().leave_many(cardboards)
+        for cardboard in cardboards:
+            self._allegiance -= cardboard.card.factions
+
+    def join_many(self, cardboards: t.Sequence[Cardboard], index: t.Optional[int] = None) -> None:
+        super().join_many(cardboards, index)
+        for cardboard in cardboards:
+            self._allegiance += cardboard.card.factions
+
+    def restore(self, cardboards: t.Iterable[Cardboard]) -> None:
+        super().restore(cardboards)
+        self._allegiance = Multiset()
+        for cardboard in self._cardboards:
+            self._allegiance += cardboard.card.factions
+
 
 class SKPlayer(ZoneOwner, Player, Target):
     allegiance: Multiset[Faction]
@@ -40,10 +66,13 @@ class SKPlayer(ZoneOwner, Player, Target):
     battlefield: Battlefield
     library: Zone[Cardboard]
     discard_pile: Zone[Cardboard]
+    zones: t.Tuple[Zone[Cardboard], ...]
+    id: int
     influence: int
     money: int
     damage: int
     opponent: SKPlayer
+    game: t.Any
 
     @abstractmethod
     def attack(self, damage: int, event: GameEvent):
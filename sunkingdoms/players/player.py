@@ -9,8 +9,9 @@ from eventtree.replaceevent import EventProperty
 
 from gameframe.events import GameEvent
 
-from sunkingdoms.artifacts.artifacts import Cardboard, Faction, CardType
-from sunkingdoms.zones import Zone
+from sunkingdoms import carddb
+from sunkingdoms.artifacts.artifacts import Cardboard, Faction
+from sunkingdoms.zones import Zone, IndexedZone
 from sunkingdoms import events as e
 from sunkingdoms.attack import Target
 from sunkingdoms.players.interface import SKPlayer as SKPlayerInterface, Battlefield
@@ -18,46 +19,85 @@ from sunkingdoms.signatures import SKPlayerSignature
 from sunkingdoms.game.interface import SKGame
 
 
+STARTING_INFLUENCE = 50
+
+
+class _CachedAllegiance(EventProperty):
+
+    def __init__(self, getter: t.Callable[[SKPlayer], Multiset[Faction]]):
+        super().__init__(getter)
+        self._getter = getter
+
+    def __get__(self, instance: t.Optional[SKPlayer], owner: t.Type[SKPlayer]) -> Multiset[Faction]:
+        if instance is None:
+            return super().__get__(instance, owner)
+        conditions = instance._session.condition_index
+        stamp = (instance.battlefield.version, conditions.version('allegiance'))
+        if stamp != instance._allegiance_stamp:
+            if conditions.has_listeners('allegiance'):
+                instance._allegiance = super().__get__(instance, owner)
+            else:
+                conditions.skip('allegiance')
+                instance._allegiance = self._getter(instance)
+            instance._allegiance_stamp = stamp
+        return instance._allegiance
+
 
 class SKPlayer(SKPlayerInterface):
     _session: SKGame
 
-    def __init__(self, game: SKGame, signature: SKPlayerSignature):
+    def __init__(self, game: SKGame, signature: SKPlayerSignature, player_id: int):
         super().__init__(game, signature)
+        self._id = player_id
 
-        self.influence: int = 50
+        self.influence: int = STARTING_INFLUENCE
         self.money: int = 0
         self.damage: int = 0
 
-        self._hand = Zone(
+        self._allegiance: t.Optional[Multiset[Faction]] = None
+        self._allegiance_stamp: t.Optional[t.Tuple[int, int]] = None
+
+        self._hand = IndexedZone(
             name = 'hand',
             ordered = False,
             private = True,
             face_up = True,
             owner = self,
+            rng = game.random,
         )
         self._battlefield = Battlefield(
             name = 'battlefield',
             ordered = False,
             private = False,
-            face_up = False,
+            face_up = True,
             owner = self,
+            rng = game.random,
         )
-        self._library = Zone(
+        self._library = IndexedZone(
             name = 'library',
             ordered = True,
             private = False,
             face_up = False,
-            owner = self
+            owner = self,
+            rng = game.random,
         )
-        self._discard_pile = Zone(
+        self._discard_pile = IndexedZone(
             name = 'discard',
             ordered = False,
             private = False,
             face_up = True,
             owner = self,
+            rng = game.random,
         )
 
+    @property
+    def game(self) -> SKGame:
+        return self._session
+
+    @property
+    def id(self) -> int:
+        return self._id
+
     @property
     def opponent(self) -> SKPlayer:
         return self._session.players.after(self)
@@ -69,16 +109,16 @@ class SKPlayer(SKPlayerInterface):
     def attack(self, damage: int, event: GameEvent) -> None:
         event.spawn_tree(e.LoseInfluence, player = self, amount = damage)
 
-    @EventProperty
+    @_CachedAllegiance
     def allegiance(self) -> Multiset[Faction]:
         return copy.copy(self.battlefield.allegiance)
 
     def get_legal_targets(self, available_damage: int) -> t.List[Target]:
-        bases = [cardboard for cardboard in self.battlefield if cardboard.card.card_type == CardType.BASE]
-        outposts = [base for base in bases if base.card.outpost]
+        bases = [cardboard for cardboard in self.battlefield if carddb.is_base(cardboard.card)]
+        outposts = [base for base in bases if carddb.is_outpost(base.card)]
         if outposts:
-            return [outpost for outpost in outposts if outpost.card.health <= available_damage]
-        return [self] + [base for base in bases if base.card.health <= available_damage]
+            return [outpost for outpost in outposts if carddb.health(outpost.card) <= available_damage]
+        return [self] + [base for base in bases if carddb.health(base.card) <= available_damage]
 
     @property
     def hand(self) -> Zone[Cardboard]:
@@ -95,3 +135,8 @@ class SKPlayer(SKPlayerInterface):
     @property
     def discard_pile(self) -> Zone[Cardboard]:
         return self._discard_pile
+
+    @property
+    def zones(self) -> t.Tuple[Zone[Cardboard], ...]:
+        return self._hand, self._battlefield, self._library, self._discard_pile
+
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import typing as t
+
+from sunkingdoms import carddb, cards, events
+from sunkingdoms.artifacts.artifacts import Action, Card, Cardboard
+from sunkingdoms.game.interface import SKGame
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.setup import SKSetup
+from sunkingdoms.zones import Zone
+
+
+class SerializationError(Exception):
+    pass
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, position: int) -> t.Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[position]
+        except IndexError:
+            raise SerializationError('truncated event')
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    return (value << 1) ^ -1 if value < 0 else value << 1
+
+
+def unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _fields(event_type: t.Type[events.SKGameEvent]) -> t.Tuple[str, ...]:
+    fields: t.List[str] = []
+    for klass in reversed(event_type.__mro__):
+        if isinstance(klass, type) and issubclass(klass, events.SKGameEvent):
+            for name in klass.__dict__.get('__annotations__', {}):
+                if name not in fields:
+                    fields.append(name)
+    return tuple(fields)
+
+
+# Wire ids and field order for every event type. Append-only: changing an existing entry changes the
+# encoding, so new event types and fields get new entries instead.
+_TARGET_MOVE = ('player', 'target', 'frm', 'to')
+
+EVENT_FORMATS: t.Tuple[t.Tuple[t.Type[events.SKGameEvent], t.Tuple[str, ...]], ...] = (
+    (events.SKGameEvent, ('player',)),
+    (events.CreateCardboard, ('player', 'to', 'card_type', 'face_up')),
+    (events.MoveCardboard, ('player', 'target', 'frm', 'to', 'index')),
+    (events.MoveCardboards, ('player', 'targets', 'frm', 'to', 'index')),
+    (events.Reshuffle, ('player',)),
+    (events.DrawCardboard, ('player',)),
+    (events.DrawCardboards, ('player', 'amount')),
+    (events.DrawHand, ('player', 'amount')),
+    (events.RefillTradeRow, _TARGET_MOVE),
+    (events.ShuffleZone, ('player', 'to', 'index')),
+    (events.SetupGame, ('player', 'setup_info')),
+    (events.CastCardboard, _TARGET_MOVE),
+    (events.DestroyCardboard, _TARGET_MOVE),
+    (events.DiscardCardboard, _TARGET_MOVE),
+    (events.ScrapCardboard, _TARGET_MOVE),
+    (events.Attack, ('player', 'target', 'amount')),
+    (events.ResourceEvent, ('player',)),
+    (events.AddMoney, ('player', 'amount')),
+    (events.SubtractMoney, ('player', 'amount')),
+    (events.PayMoney, ('player', 'amount')),
+    (events.BuyCardboard, _TARGET_MOVE),
+    (events.AddDamage, ('player', 'amount')),
+    (events.SubtractDamage, ('player', 'amount')),
+    (events.ResetResources, ('player',)),
+    (events.ActivateAction, ('player', 'target', 'action')),
+    (events.GainInfluence, ('player', 'amount')),
+    (events.LoseInfluence, ('player', 'amount')),
+    (events.TakeTurn, ('player',)),
+    (events.GameFinished, ('player', 'winner')),
+    (events.PlayGame, ('player', 'setup_info')),
+)
+
+EVENT_TYPES: t.Tuple[t.Type[events.SKGameEvent], ...] = tuple(event_type for event_type, _ in EVENT_FORMATS)
+
+EVENT_FIELDS: t.Tuple[t.Tuple[str, ...], ...] = tuple(fields for _, fields in EVENT_FORMATS)
+
+EVENT_TYPE_IDS: t.Mapping[t.Type[events.SKGameEvent], int] = {
+    event_type: event_type_id
+    for event_type_id, event_type in
+    enumerate(EVENT_TYPES)
+}
+
+
+def _check_formats() -> None:
+    for value in vars(events).values():
+        if isinstance(value, type) and issubclass(value, events.SKGameEvent) and value.__module__ == events.__name__:
+            if value not in EVENT_TYPE_IDS:
+                raise SerializationError('event type {} has no wire format'.format(value.__name__))
+            if set(EVENT_FIELDS[EVENT_TYPE_IDS[value]]) != set(_fields(value)):
+                raise SerializationError('wire format of {} does not match its fields'.format(value.__name__))
+
+
+_check_formats()
+
+ACTION_IDS: t.Mapping[Action, t.Tuple[int, int]] = {
+    action: (card_type.card_id, index)
+    for card_type in
+    carddb.CARD_TYPES
+    for index, action in
+    enumerate(card_type.action_definitions())
+}
+
+NONE, FALSE, TRUE, INT, PLAYER, ZONE, CARDBOARD, CARD_TYPE, ACTION, SEQUENCE, SETUP = range(11)
+
+
+class DecodedEvent(t.NamedTuple):
+    event_type: t.Type[events.SKGameEvent]
+    values: t.Dict[str, t.Any]
+
+    def resolve(self, game: SKGame) -> t.Any:
+        return game.resolve_event(
+            self.event_type,
+            **{
+                name: value
+                for name, value in
+                self.values.items()
+                if value is not None
+            },
+        )
+
+
+class EventCodec(object):
+
+    def __init__(self, game: SKGame):
+        self._game = game
+
+    def _write_value(self, buffer: bytearray, value: t.Any) -> None:
+        if value is None:
+            buffer.append(NONE)
+        elif isinstance(value, bool):
+            buffer.append(TRUE if value else FALSE)
+        elif isinstance(value, int):
+            buffer.append(INT)
+            write_varint(buffer, zigzag(value))
+        elif isinstance(value, SKPlayer):
+            buffer.append(PLAYER)
+            write_varint(buffer, value.id)
+        elif isinstance(value, Zone):
+            buffer.append(ZONE)
+            write_varint(buffer, value.id)
+        elif isinstance(value, Cardboard):
+            buffer.append(CARDBOARD)
+            write_varint(buffer, value.id)
+        elif isinstance(value, type) and issubclass(value, Card) and value.card_id is not None:
+            buffer.append(CARD_TYPE)
+            write_varint(buffer, value.card_id)
+        elif isinstance(value, Action) and value in ACTION_IDS:
+            buffer.append(ACTION)
+            for part in ACTION_IDS[value]:
+                write_varint(buffer, part)
+        elif isinstance(value, (list, tuple)):
+            buffer.append(SEQUENCE)
+            write_varint(buffer, len(value))
+            for item in value:
+                self._write_value(buffer, item)
+        elif isinstance(value, SKSetup):
+            buffer.append(SETUP)
+            write_varint(buffer, value.player_count)
+            self._write_value(buffer, value.seed)
+        else:
+            raise SerializationError('cannot serialize {!r}'.format(value))
+
+    def _read_value(self, data: bytes, position: int) -> t.Tuple[t.Any, int]:
+        try:
+            tag = data[position]
+        except IndexError:
+            raise SerializationError('truncated event')
+        position += 1
+        if tag == NONE:
+            return None, position
+        if tag == FALSE or tag == TRUE:
+            return tag == TRUE, position
+        if tag == SEQUENCE:
+            length, position = read_varint(data, position)
+            items = []
+            for _ in range(length):
+                item, position = self._read_value(data, position)
+                items.append(item)
+            return items, position
+        if tag == SETUP:
+            player_count, position = read_varint(data, position)
+            seed, position = self._read_value(data, position)
+            return SKSetup(player_count, seed = seed), position
+
+        value, position = read_varint(data, position)
+        if tag == INT:
+            return unzigzag(value), position
+        try:
+            if tag == PLAYER:
+                return self._game.player(value), position
+            if tag == ZONE:
+                return self._game.zone(value), position
+            if tag == CARDBOARD:
+                return self._game.cardboard(value), position
+            if tag == CARD_TYPE:
+                return carddb.CARD_TYPES[value], position
+            if tag == ACTION:
+                index, position = read_varint(data, position)
+                return carddb.CARD_TYPES[value].action_definitions()[index], position
+        except IndexError:
+            raise SerializationError('unknown id {} for value tag {}'.format(value, tag))
+        raise SerializationError('unknown value tag {}'.format(tag))
+
+    def encode(self, event: events.SKGameEvent) -> bytes:
+        try:
+            event_type_id = EVENT_TYPE_IDS[event.__class__]
+        except KeyError:
+            raise SerializationError('unknown event type {}'.format(event.__class__.__name__))
+        buffer = bytearray()
+        write_varint(buffer, event_type_id)
+        # values include those inherited from the parent event, so every event decodes standalone.
+        values = event.values
+        for name in EVENT_FIELDS[event_type_id]:
+            self._write_value(buffer, values.get(name))
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> DecodedEvent:
+        event_type_id, position = read_varint(data, 0)
+        try:
+            fields = EVENT_FIELDS[event_type_id]
+        except IndexError:
+            raise SerializationError('unknown event type id {}'.format(event_type_id))
+        values = {}
+        for name in fields:
+            values[name], position = self._read_value(data, position)
+        if position != len(data):
+            raise SerializationError('{} trailing bytes after event'.format(len(data) - position))
+        return DecodedEvent(EVENT_TYPES[event_type_id], values)
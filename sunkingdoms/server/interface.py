@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import typing as t
+
+from gameframe.connectioncontroller import ConnectionController
+from gameframe.events import GameEvent
+from gameframe.interface import GameInterface, Option, O
+
+from sunkingdoms import events
+from sunkingdoms.client.protocol import encode_option
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.server.state import StateTracker
+
+if t.TYPE_CHECKING:
+    from sunkingdoms.server.table import Table
+
+
+class RemoteInterface(GameInterface):
+
+    def __init__(self, controller: ConnectionController, table: Table):
+        super().__init__(controller)
+        self._table = table
+        self._tracker: t.Optional[StateTracker] = None
+
+    @property
+    def tracker(self) -> t.Optional[StateTracker]:
+        return self._tracker
+
+    def track(self, tracker: StateTracker) -> None:
+        self._tracker = tracker
+
+    async def select_option_async(self, player: SKPlayer, options: t.Iterable[O]) -> O:
+        options = list(options)
+        if len(options) == 1:
+            return options[0]
+        await self._table.publish()
+        index, = await self._table.decide(
+            player.signature,
+            {
+                'type': 'select_option',
+                'options': [encode_option(option) for option in options],
+            },
+        )
+        return options[index]
+
+    async def select_options_async(
+        self,
+        player: SKPlayer,
+        options: t.Iterable[O],
+        minimum: int = 0,
+        maximum: t.Optional[int] = None,
+    ) -> t.List[O]:
+        options = list(options)
+        await self._table.publish()
+        indices = await self._table.decide(
+            player.signature,
+            {
+                'type': 'select_options',
+                'options': [encode_option(option) for option in options],
+                'minimum': minimum,
+                'maximum': maximum,
+            },
+        )
+        return [options[index] for index in indices]
+
+    async def select_string_async(self, player: SKPlayer, prompt: str, options: t.Iterable[str]) -> str:
+        options = list(options)
+        await self._table.publish()
+        index, = await self._table.decide(
+            player.signature,
+            {
+                'type': 'select_string',
+                'prompt': prompt,
+                'options': [encode_option(Option('select string', option)) for option in options],
+            },
+        )
+        return options[index]
+
+    def select_option(self, player: SKPlayer, options: t.Iterable[O]) -> O:
+        return self._table.wait(self.select_option_async(player, options))
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Iterable[O],
+        minimum: int = 0,
+        maximum: t.Optional[int] = None,
+    ) -> t.Iterable[O]:
+        return self._table.wait(self.select_options_async(player, options, minimum, maximum))
+
+    def select_string(self, player: SKPlayer, prompt: str, options: t.Iterable[str]) -> str:
+        return self._table.wait(self.select_string_async(player, prompt, options))
+
+    def notify_event_start(self, event: GameEvent) -> None:
+        if self._tracker is not None and isinstance(event, events.ShuffleZone):
+            self._tracker.observe()
+
+    def notify_event_end(self, event: GameEvent, success: bool) -> None:
+        if success and self._tracker is not None and isinstance(event, events.ShuffleZone):
+            self._tracker.shuffled(event.to)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import bisect
+import math
+import typing as t
+
+
+DEFAULT_BOUNDS: t.Tuple[float, ...] = (.01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10., 30., 60.)
+
+
+class LatencyHistogram(object):
+
+    def __init__(self, bounds: t.Sequence[float] = DEFAULT_BOUNDS):
+        self._bounds = tuple(bounds)
+        self._buckets = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total = 0.
+        self._maximum = 0.
+        self._timeouts = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def timeouts(self) -> int:
+        return self._timeouts
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count if self._count else 0.
+
+    @property
+    def maximum(self) -> float:
+        return self._maximum
+
+    def record(self, seconds: float) -> None:
+        self._buckets[bisect.bisect_left(self._bounds, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        self._maximum = max(self._maximum, seconds)
+
+    def record_timeout(self) -> None:
+        self._timeouts += 1
+
+    def percentile(self, fraction: float) -> float:
+        if not self._count:
+            return 0.
+        target = fraction * self._count
+        seen = 0
+        for bound, amount in zip(self._bounds + (math.inf,), self._buckets):
+            seen += amount
+            if seen >= target:
+                return min(bound, self._maximum)
+        return self._maximum
+
+    def merge(self, other: LatencyHistogram) -> None:
+        if other._bounds != self._bounds:
+            raise ValueError('cannot merge histograms with different bounds')
+        for index, amount in enumerate(other._buckets):
+            self._buckets[index] += amount
+        self._count += other._count
+        self._total += other._total
+        self._maximum = max(self._maximum, other._maximum)
+        self._timeouts += other._timeouts
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'count': self._count,
+            'timeouts': self._timeouts,
+            'mean': self.mean,
+            'p50': self.percentile(.5),
+            'p90': self.percentile(.9),
+            'p99': self.percentile(.99),
+            'max': self._maximum,
+            'buckets': {
+                'inf' if bound == math.inf else '<={}'.format(bound): amount
+                for bound, amount in
+                zip(self._bounds + (math.inf,), self._buckets)
+            },
+        }
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import typing as t
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sunkingdoms.client.protocol import MessageStream, ProtocolError
+from sunkingdoms.server.latency import LatencyHistogram
+from sunkingdoms.server.table import Table
+
+
+logger = logging.getLogger(__name__)
+
+
+class GameServer(object):
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        player_count: int = 2,
+        seed: t.Optional[int] = None,
+        max_tables: int = 256,
+        decision_timeout: t.Optional[float] = None,
+    ):
+        self._host = host
+        self._port = port
+        self._player_count = player_count
+        self._seed = seed
+        self._decision_timeout = decision_timeout
+        self._max_tables = max_tables
+        self._executor = ThreadPoolExecutor(max_workers = max_tables, thread_name_prefix = 'table')
+
+        self._tables: t.Dict[str, Table] = {}
+        self._open: t.Optional[Table] = None
+        self._table_numbers = itertools.count()
+        self._server: t.Optional[asyncio.AbstractServer] = None
+        self._latencies: t.Dict[str, LatencyHistogram] = {}
+        self._running: t.Set[Table] = set()
+
+    @property
+    def tables(self) -> t.Mapping[str, Table]:
+        return self._tables
+
+    @property
+    def latencies(self) -> t.Mapping[str, LatencyHistogram]:
+        return self._latencies
+
+    @property
+    def address(self) -> t.Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        running = list(self._running)
+        for table in running:
+            table.close()
+        await asyncio.gather(*(table.task for table in running), return_exceptions = True)
+        self._executor.shutdown(wait = True)
+
+    async def __aenter__(self) -> GameServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _create_table(self, table_id: t.Optional[str] = None) -> Table:
+        number = next(self._table_numbers)
+        table = Table(
+            str(number) if table_id is None else table_id,
+            self._player_count,
+            self._executor,
+            seed = None if self._seed is None else self._seed + number,
+            decision_timeout = self._decision_timeout,
+        )
+        self._tables[table.id] = table
+        return table
+
+    def _table(self, table_id: t.Optional[str]) -> Table:
+        if table_id is not None:
+            return self._tables[table_id] if table_id in self._tables else self._create_table(table_id)
+        if self._open is None or self._open.full or self._open.started:
+            self._open = self._create_table()
+        return self._open
+
+    def _start_table(self, table: Table) -> bool:
+        if len(self._running) >= self._max_tables:
+            self._tables.pop(table.id, None)
+            if self._open is table:
+                self._open = None
+            return False
+        self._running.add(table)
+        table.start().add_done_callback(lambda task: self._table_finished(table, task))
+        return True
+
+    def _table_finished(self, table: Table, task: asyncio.Task) -> None:
+        self._running.discard(table)
+        self._tables.pop(table.id, None)
+        for signature, histogram in table.latencies.items():
+            self._latencies.setdefault(signature.name, LatencyHistogram()).merge(histogram)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('table %s failed', table.id, exc_info = task.exception())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = MessageStream(reader, writer)
+        table = signature = None
+        try:
+            message = await connection.receive()
+            if message['type'] != 'join':
+                raise ProtocolError('expected join, got {}'.format(message['type']))
+
+            table = self._table(message.get('table'))
+            signature = table.seat(message['name'], connection)
+            await connection.send({'type': 'joined', 'table': table.id, 'player': signature.name})
+            if table.full and not self._start_table(table):
+                await table.reject('server is at capacity ({} tables)'.format(self._max_tables))
+                return
+
+            async for message in connection:
+                if message['type'] == 'leave':
+                    break
+                if message['type'] == 'resync':
+                    table.resync(signature)
+                    continue
+                if message['type'] != 'choice':
+                    await connection.send({'type': 'error', 'message': 'unknown message {}'.format(message['type'])})
+                    continue
+                try:
+                    table.resolve(signature, message['request'], message['indices'])
+                except (ProtocolError, KeyError, TypeError) as e:
+                    await connection.send({'type': 'error', 'message': str(e)})
+
+        except (ProtocolError, KeyError) as e:
+            try:
+                await connection.send({'type': 'error', 'message': str(e)})
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            if signature is not None:
+                table.disconnect(signature)
+            await connection.close()
+
+
+async def _serve(server: GameServer) -> None:
+    await server.start()
+    logger.info('serving on %s:%d', *server.address)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description = 'Host sunkingdoms tables.')
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 7777)
+    parser.add_argument('--players', type = int, default = 2)
+    parser.add_argument('--seed', type = int, default = None)
+    parser.add_argument('--max-tables', type = int, default = 256)
+    parser.add_argument('--decision-timeout', type = float, default = 60.)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level = logging.INFO)
+    asyncio.run(
+        _serve(
+            GameServer(
+                args.host,
+                args.port,
+                player_count = args.players,
+                seed = args.seed,
+                max_tables = args.max_tables,
+                decision_timeout = args.decision_timeout,
+            )
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
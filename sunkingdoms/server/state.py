@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import typing as t
+
+from sunkingdoms.artifacts.artifacts import Cardboard
+from sunkingdoms.client.protocol import Message
+from sunkingdoms.game.game import SKGame
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.zones import Zone
+
+
+RESOURCES = ('influence', 'money', 'damage')
+
+Op = t.Tuple[t.Any, ...]
+
+
+def zone_key(zone: Zone) -> str:
+    if zone.owner is None:
+        return zone.name
+    return '{}:{}'.format(zone.owner.signature.name, zone.name)
+
+
+def visible(zone: Zone, viewer: t.Optional[SKPlayer]) -> bool:
+    return zone.face_up and (not zone.private or viewer is not None and zone.owner is viewer)
+
+
+class StateTracker(object):
+
+    def __init__(self, game: SKGame, snapshot_interval: int = 50):
+        self._game = game
+        self._snapshot_interval = snapshot_interval
+
+        self._zones = tuple(game.zones)
+        self._players = tuple(game.players.all)
+        self._versions: t.Dict[Zone, int] = {}
+        self._locations: t.Dict[Cardboard, Zone] = {}
+        self._resources: t.Dict[SKPlayer, t.Tuple[int, ...]] = {}
+
+        self._ops: t.List[Op] = []
+        self._sequence = 0
+
+        for zone in self._zones:
+            self._versions[zone] = zone.version
+            for cardboard in zone:
+                self._locations[cardboard] = zone
+        for player in self._players:
+            self._resources[player] = self._read_resources(player)
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def players(self) -> t.Tuple[SKPlayer, ...]:
+        return self._players
+
+    @classmethod
+    def _read_resources(cls, player: SKPlayer) -> t.Tuple[int, ...]:
+        return tuple(getattr(player, resource) for resource in RESOURCES)
+
+    def observe(self) -> None:
+        # Only arrivals are diffed: reorders within a zone are not reported, and moves are grouped by
+        # destination zone rather than in the order they were resolved. Clients needing exact ordering
+        # of visible zones should rely on snapshots.
+        for zone in self._zones:
+            if zone.version == self._versions[zone]:
+                continue
+            self._versions[zone] = zone.version
+            arrivals = []
+            for cardboard in zone:
+                previous = self._locations.get(cardboard)
+                if previous is not zone:
+                    self._locations[cardboard] = zone
+                    arrivals.append(('move', cardboard, previous, zone))
+            if zone.ordered and not zone.face_up:
+                arrivals.sort(key = lambda op: op[1].id)
+            self._ops.extend(arrivals)
+
+        for player in self._players:
+            resources = self._read_resources(player)
+            previous = self._resources[player]
+            if resources != previous:
+                self._resources[player] = resources
+                for resource, value, _value in zip(RESOURCES, resources, previous):
+                    if value != _value:
+                        self._ops.append(('resource', player, resource, value))
+
+    def shuffled(self, zone: Zone) -> None:
+        self._ops.append(('shuffle', zone))
+
+    def _render(self, op: Op, viewer: t.Optional[SKPlayer]) -> t.List[t.Any]:
+        if op[0] == 'move':
+            _, cardboard, frm, to = op
+            shown = visible(to, viewer)
+            known = shown or frm is not None and visible(frm, viewer)
+            return [
+                'move',
+                cardboard.id if known else None,
+                None if frm is None else zone_key(frm),
+                zone_key(to),
+                cardboard.name if shown else None,
+            ]
+        if op[0] == 'resource':
+            _, player, resource, value = op
+            return ['resource', player.signature.name, resource, value]
+        return ['shuffle', zone_key(op[1])]
+
+    def snapshot(self, viewer: t.Optional[SKPlayer]) -> Message:
+        return {
+            'type': 'snapshot',
+            'sequence': self._sequence,
+            'players': {
+                player.signature.name: dict(zip(RESOURCES, self._resources[player]))
+                for player in
+                self._players
+            },
+            'zones': {
+                zone_key(zone): {
+                    'count': len(zone),
+                    'cards': [
+                        [cardboard.id, cardboard.name]
+                        for cardboard in
+                        zone
+                    ] if visible(zone, viewer) else None,
+                }
+                for zone in
+                self._zones
+            },
+        }
+
+    def flush(self, viewers: t.Iterable[t.Optional[SKPlayer]]) -> t.Dict[t.Optional[SKPlayer], Message]:
+        self.observe()
+        if not self._ops:
+            return {}
+        ops, self._ops = self._ops, []
+        self._sequence += 1
+        if not self._sequence % self._snapshot_interval:
+            return {viewer: self.snapshot(viewer) for viewer in viewers}
+        return {
+            viewer: {
+                'type': 'delta',
+                'sequence': self._sequence,
+                'ops': [self._render(op, viewer) for op in ops],
+            }
+            for viewer in
+            viewers
+        }
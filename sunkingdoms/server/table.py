@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import typing as t
+
+from concurrent.futures import Executor
+
+from sunkingdoms import events
+from sunkingdoms.client.protocol import MessageStream, ProtocolError, Message
+from sunkingdoms.interface import SKDummyController
+from sunkingdoms.livegame import LiveGame
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.server.interface import RemoteInterface
+from sunkingdoms.server.latency import LatencyHistogram
+from sunkingdoms.server.state import StateTracker
+from sunkingdoms.setup import SKSetup
+from sunkingdoms.signatures import SKPlayerSignature
+
+
+T = t.TypeVar('T')
+
+
+class PlayerDisconnected(Exception):
+    pass
+
+
+class TableClosed(Exception):
+    pass
+
+
+def default_choice(message: Message) -> t.List[int]:
+    if message['type'] == 'select_options':
+        return list(range(message['minimum']))
+    for index, option in enumerate(message['options']):
+        if option['type'] == 'pass turn':
+            return [index]
+    return [0]
+
+
+class _Decision(t.NamedTuple):
+    signature: SKPlayerSignature
+    future: asyncio.Future
+    option_count: int
+    minimum: int
+    maximum: int
+
+
+class Table(object):
+
+    def __init__(
+        self,
+        table_id: str,
+        player_count: int,
+        executor: Executor,
+        seed: t.Optional[int] = None,
+        decision_timeout: t.Optional[float] = None,
+        snapshot_interval: int = 50,
+    ):
+        self._id = table_id
+        self._player_count = player_count
+        self._executor = executor
+        self._seed = seed
+        self._decision_timeout = decision_timeout
+        self._snapshot_interval = snapshot_interval
+
+        self._seats: t.Dict[SKPlayerSignature, MessageStream] = {}
+        self._disconnected: t.Set[SKPlayerSignature] = set()
+        self._decisions: t.Dict[int, _Decision] = {}
+        self._expired: t.Set[int] = set()
+        self._latencies: t.Dict[SKPlayerSignature, LatencyHistogram] = {}
+        self._requests = itertools.count()
+        self._loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self._task: t.Optional[asyncio.Task] = None
+        self._closed = False
+
+        self._tracker: t.Optional[StateTracker] = None
+        self._viewers: t.Dict[SKPlayerSignature, SKPlayer] = {}
+        self._resyncs: t.Set[SKPlayerSignature] = set()
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def signatures(self) -> t.Tuple[SKPlayerSignature, ...]:
+        return tuple(self._seats)
+
+    @property
+    def full(self) -> bool:
+        return len(self._seats) >= self._player_count
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    @property
+    def latencies(self) -> t.Mapping[SKPlayerSignature, LatencyHistogram]:
+        return self._latencies
+
+    @property
+    def task(self) -> t.Optional[asyncio.Task]:
+        return self._task
+
+    def seat(self, name: str, connection: MessageStream) -> SKPlayerSignature:
+        signature = SKPlayerSignature(name)
+        if self.full or self.started:
+            raise ProtocolError('table {} is full'.format(self._id))
+        if signature in self._seats:
+            raise ProtocolError('name {} is taken at table {}'.format(name, self._id))
+        self._seats[signature] = connection
+        self._latencies[signature] = LatencyHistogram()
+        return signature
+
+    def start(self) -> asyncio.Task:
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> t.Optional[str]:
+        try:
+            winner = await self._loop.run_in_executor(self._executor, self._play)
+        except (PlayerDisconnected, TableClosed) as e:
+            await self.broadcast({'type': 'aborted', 'reason': str(e)})
+            return None
+        except Exception:
+            await self.broadcast({'type': 'aborted', 'reason': 'internal server error'})
+            raise
+        await self.publish()
+        await self.broadcast({'type': 'finished', 'winner': winner})
+        return winner
+
+    def _create_game(self, signatures: t.Sequence[SKPlayerSignature]) -> LiveGame:
+        interface = RemoteInterface(SKDummyController(signatures), self)
+        game = LiveGame(
+            SKSetup(len(signatures), seed = self._seed),
+            interface,
+            signatures,
+        )
+        self._tracker = StateTracker(game, self._snapshot_interval)
+        self._viewers = {player.signature: player for player in self._tracker.players}
+        interface.track(self._tracker)
+        return game
+
+    def _play(self) -> t.Optional[str]:
+        game = self._create_game(self.signatures)
+        game.start()
+        winner = events.find_winner(game)
+        return None if winner is None else winner.signature.name
+
+    def wait(self, coroutine: t.Awaitable[T]) -> T:
+        if self._closed:
+            coroutine.close()
+            raise TableClosed('server shutting down')
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        self._closed = True
+        for decision in self._decisions.values():
+            if not decision.future.done():
+                decision.future.set_exception(TableClosed('server shutting down'))
+
+    async def reject(self, reason: str) -> None:
+        self._closed = True
+        await self.broadcast({'type': 'aborted', 'reason': reason})
+
+    @classmethod
+    def _bounds(cls, message: Message) -> t.Tuple[int, int, int]:
+        option_count = len(message['options'])
+        if message['type'] == 'select_options':
+            maximum = message['maximum']
+            return option_count, message['minimum'], option_count if maximum is None else maximum
+        return option_count, 1, 1
+
+    def _fall_back(self, signature: SKPlayerSignature, default: t.List[int]) -> t.List[int]:
+        self._disconnected.add(signature)
+        if self._disconnected.issuperset(self._seats):
+            raise PlayerDisconnected('all players disconnected')
+        return default
+
+    async def decide(self, signature: SKPlayerSignature, message: Message) -> t.List[int]:
+        if self._closed:
+            raise TableClosed('server shutting down')
+        default = default_choice(message)
+        if signature in self._disconnected:
+            return self._fall_back(signature, default)
+
+        request = next(self._requests)
+        decision = self._decisions[request] = _Decision(
+            signature,
+            self._loop.create_future(),
+            *self._bounds(message),
+        )
+        started = self._loop.time()
+        try:
+            await self._seats[signature].send(dict(message, request = request, timeout = self._decision_timeout))
+            indices = await asyncio.wait_for(decision.future, self._decision_timeout)
+        except asyncio.TimeoutError:
+            self._latencies[signature].record_timeout()
+            self._expired.add(request)
+            try:
+                await self._seats[signature].send({'type': 'timeout', 'request': request, 'indices': default})
+            except ConnectionError:
+                return self._fall_back(signature, default)
+            return default
+        except (PlayerDisconnected, ConnectionError):
+            return self._fall_back(signature, default)
+        finally:
+            del self._decisions[request]
+
+        self._latencies[signature].record(self._loop.time() - started)
+        return indices
+
+    def resolve(self, signature: SKPlayerSignature, request: int, indices: t.Sequence[int]) -> None:
+        if request in self._expired:
+            self._expired.discard(request)
+            return
+        decision = self._decisions.get(request)
+        if decision is None or decision.future.done():
+            raise ProtocolError('no pending request {}'.format(request))
+        if decision.signature != signature:
+            raise ProtocolError('request {} belongs to another player'.format(request))
+        if (
+            not decision.minimum <= len(indices) <= decision.maximum
+            or len(set(indices)) != len(indices)
+            or not all(isinstance(index, int) and 0 <= index < decision.option_count for index in indices)
+        ):
+            raise ProtocolError('invalid choice {} for request {}'.format(indices, request))
+        decision.future.set_result(list(indices))
+
+    def disconnect(self, signature: SKPlayerSignature) -> None:
+        if not self.started:
+            self._seats.pop(signature, None)
+            return
+        self._disconnected.add(signature)
+        for decision in self._decisions.values():
+            if decision.signature == signature and not decision.future.done():
+                decision.future.set_exception(PlayerDisconnected(signature.name))
+
+    def resync(self, signature: SKPlayerSignature) -> None:
+        self._resyncs.add(signature)
+
+    async def publish(self) -> None:
+        if self._tracker is None:
+            return
+        viewers = [
+            self._viewers[signature]
+            for signature in
+            self._seats
+            if signature not in self._disconnected
+        ]
+        messages = self._tracker.flush(viewers)
+        for viewer in viewers:
+            signature = viewer.signature
+            if signature in self._resyncs:
+                self._resyncs.discard(signature)
+                message = self._tracker.snapshot(viewer)
+            else:
+                message = messages.get(viewer)
+            if message is None:
+                continue
+            try:
+                await self._seats[signature].send(message)
+            except ConnectionError:
+                self._disconnected.add(signature)
+
+    async def broadcast(self, message: Message) -> None:
+        for signature, connection in self._seats.items():
+            if signature in self._disconnected:
+                continue
+            try:
+                await connection.send(message)
+            except ConnectionError:
+                self._disconnected.add(signature)
@@ -1,11 +1,18 @@
+import typing as t
+
 from gameframe.setupinfo import SetupInfo
 
 
 class SKSetup(SetupInfo):
 
-    def __init__(self, player_count: int):
+    def __init__(self, player_count: int, seed: t.Optional[int] = None):
         self._player_count = player_count
+        self._seed = seed
 
     @property
     def player_count(self) -> int:
-        return self._player_count
\ No newline at end of file
+        return self._player_count
+
+    @property
+    def seed(self) -> t.Optional[int]:
+        return self._seed
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import typing as t
+
+import numpy as np
+
+from sunkingdoms import carddb, cards
+from sunkingdoms import events
+from sunkingdoms.players.player import STARTING_INFLUENCE
+from sunkingdoms.simulation.compact import (
+    CARDS, CARD_IDS, FACTIONS, ALLY, SCRAP, MONEY, DAMAGE, INFLUENCE, DRAW, Effects, UnsupportedCard,
+)
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import play_games, create_signatures
+
+
+def _effects(effects: t.Optional[Effects]) -> Effects:
+    return (0, 0, 0, 0) if effects is None else effects
+
+
+PRICES = np.array(carddb.PRICES, dtype = np.int32)
+HEALTH = np.array(carddb.HEALTH, dtype = np.int32)
+BASES = np.array(carddb.BASES, dtype = bool)
+OUTPOSTS = np.array(carddb.OUTPOSTS, dtype = bool)
+ON_PLAY = np.array([_effects(entry.on_play) for entry in CARDS], dtype = np.int32)
+ALLEGIANCE = np.array(
+    [
+        [bool(entry.allegiance & 1 << index) for index in range(len(FACTIONS))]
+        for entry in
+        CARDS
+    ],
+    dtype = np.int32,
+)
+
+_ACTIONS = [
+    (card_id, action)
+    for card_id, entry in
+    enumerate(CARDS)
+    for action in
+    entry.actions
+]
+
+ACTION_CARDS = np.array([card_id for card_id, _ in _ACTIONS], dtype = np.intp)
+ACTION_ALLY = np.array([action.kind == ALLY for _, action in _ACTIONS], dtype = bool)
+ACTION_FACTIONS = np.array([max(action.faction, 0) for _, action in _ACTIONS], dtype = np.intp)
+ACTION_REQUIREMENTS = np.array([action.requirement for _, action in _ACTIONS], dtype = np.int32)
+ACTION_EFFECTS = np.array([_effects(action.effects) for _, action in _ACTIONS], dtype = np.int32).reshape(-1, 4)
+ACTION_SCRAPS = np.zeros((len(_ACTIONS), len(CARDS)), dtype = np.int32)
+for _index, (_card_id, _action) in enumerate(_ACTIONS):
+    if _action.kind == SCRAP:
+        ACTION_SCRAPS[_index, _card_id] = 1
+
+
+def _sample(rng: np.random.Generator, counts: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    totals = counts.sum(axis = 1)
+    thresholds = rng.random(len(counts)) * totals
+    picks = (counts.cumsum(axis = 1) > thresholds[:, None]).argmax(axis = 1)
+    return np.where(mask & (totals > 0), picks, -1)
+
+
+def _move(frm: np.ndarray, to: np.ndarray, picks: np.ndarray) -> None:
+    rows = np.flatnonzero(picks >= 0)
+    frm[rows, picks[rows]] -= 1
+    to[rows, picks[rows]] += 1
+
+
+class BatchResult(t.NamedTuple):
+    winners: np.ndarray
+    turns: np.ndarray
+    influence: np.ndarray
+
+    def win_rate(self, player: int) -> float:
+        return float(np.mean(self.winners == player))
+
+    @property
+    def mean_turns(self) -> float:
+        return float(np.mean(self.turns))
+
+
+class BatchSimulator(object):
+
+    def __init__(self, games: int, player_count: int = 2, seed: t.Optional[int] = None):
+        for card_type, _ in cards.TRADE_DECK + cards.STARTING_DECK:
+            if card_type not in CARD_IDS or not CARDS[CARD_IDS[card_type]].supported:
+                raise UnsupportedCard(card_type.name)
+
+        self._games = games
+        self._player_count = player_count
+        self._random = np.random.default_rng(seed)
+
+        shape = (games, player_count, len(CARDS))
+        self.library = np.zeros(shape, dtype = np.int32)
+        self.hand = np.zeros(shape, dtype = np.int32)
+        self.battlefield = np.zeros(shape, dtype = np.int32)
+        self.discard = np.zeros(shape, dtype = np.int32)
+        self.used = np.zeros((games, player_count, len(_ACTIONS)), dtype = np.int32)
+
+        self.trade_deck = np.zeros((games, len(CARDS)), dtype = np.int32)
+        self.trade_row = np.zeros((games, len(CARDS)), dtype = np.int32)
+        self.scrap_pile = np.zeros((games, len(CARDS)), dtype = np.int32)
+
+        self.money = np.zeros((games, player_count), dtype = np.int32)
+        self.damage = np.zeros((games, player_count), dtype = np.int32)
+        self.influence = np.full((games, player_count), STARTING_INFLUENCE, dtype = np.int32)
+
+        self.winners = np.full(games, -1, dtype = np.int32)
+        self.turns = np.zeros(games, dtype = np.int32)
+
+        self._set_up()
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.winners < 0
+
+    @property
+    def allegiance(self) -> np.ndarray:
+        return self.battlefield @ ALLEGIANCE
+
+    def _set_up(self) -> None:
+        everywhere = np.ones(self._games, dtype = bool)
+        for card_type, amount in cards.TRADE_DECK:
+            self.trade_deck[:, CARD_IDS[card_type]] += amount
+        for _ in range(events.TRADE_ROW_SIZE):
+            _move(self.trade_deck, self.trade_row, _sample(self._random, self.trade_deck, everywhere))
+        for card_type, amount in cards.STARTING_DECK:
+            self.discard[:, :, CARD_IDS[card_type]] += amount
+        for player in range(self._player_count):
+            self._draw(player, np.full(self._games, events.HAND_SIZE))
+
+    def _draw(self, player: int, amounts: np.ndarray) -> None:
+        library, hand, discard = self.library[:, player], self.hand[:, player], self.discard[:, player]
+        remaining = amounts.copy()
+        while True:
+            mask = remaining > 0
+            if not mask.any():
+                return
+            empty = mask & (library.sum(axis = 1) == 0)
+            library[empty] += discard[empty]
+            discard[empty] = 0
+            _move(library, hand, _sample(self._random, library, mask))
+            remaining[mask] -= 1
+
+    def _apply(self, player: int, effects: np.ndarray) -> None:
+        self.money[:, player] += effects[:, MONEY]
+        self.damage[:, player] += effects[:, DAMAGE]
+        self.influence[:, player] += effects[:, INFLUENCE]
+        self._draw(player, effects[:, DRAW])
+
+    def _play(self, player: int, alive: np.ndarray) -> None:
+        battlefield, used = self.battlefield[:, player], self.used[:, player]
+        used[:] = 0
+        while True:
+            played = self.hand[:, player] * alive[:, None]
+            self.hand[:, player] -= played
+            battlefield += played
+
+            fulfilled = ~ACTION_ALLY | (
+                (battlefield @ ALLEGIANCE)[:, ACTION_FACTIONS] >= ACTION_REQUIREMENTS
+            )
+            activated = np.maximum(battlefield[:, ACTION_CARDS] - used, 0) * fulfilled * alive[:, None]
+            used += activated
+
+            scrapped = activated @ ACTION_SCRAPS
+            battlefield -= scrapped
+            self.scrap_pile += scrapped
+
+            self._apply(player, played @ ON_PLAY + activated @ ACTION_EFFECTS)
+
+            if not (played.any() or activated.any()):
+                return
+
+    def _buy(self, player: int, alive: np.ndarray) -> None:
+        money, discard = self.money[:, player], self.discard[:, player]
+        while True:
+            affordable = (self.trade_row > 0) & (PRICES <= money[:, None]) & alive[:, None]
+            buying = affordable.any(axis = 1)
+            if not buying.any():
+                return
+            picks = np.where(buying, np.where(affordable, PRICES, -1).argmax(axis = 1), -1)
+            rows = np.flatnonzero(buying)
+            money[rows] -= PRICES[picks[rows]]
+            _move(self.trade_row, discard, picks)
+            _move(self.trade_deck, self.trade_row, _sample(self._random, self.trade_deck, buying))
+
+    def _attack(self, player: int, opponent: int) -> None:
+        damage, battlefield = self.damage[:, player], self.battlefield[:, opponent]
+        while True:
+            has_outposts = (battlefield * OUTPOSTS).sum(axis = 1) > 0
+            targets = (
+                (battlefield > 0)
+                & BASES
+                & (HEALTH <= damage[:, None])
+                & (OUTPOSTS | ~has_outposts[:, None])
+                & (damage > 0)[:, None]
+            )
+            attacking = targets.any(axis = 1)
+
+            hitting_player = (damage > 0) & ~has_outposts & ~attacking
+            self.influence[hitting_player, opponent] -= damage[hitting_player]
+            damage[hitting_player] = 0
+
+            if not attacking.any():
+                return
+            picks = np.where(attacking, np.where(targets, HEALTH, -1).argmax(axis = 1), -1)
+            rows = np.flatnonzero(attacking)
+            damage[rows] -= HEALTH[picks[rows]]
+            _move(battlefield, self.discard[:, opponent], picks)
+
+    def _clean_up(self, player: int, alive: np.ndarray) -> None:
+        ships = self.battlefield[:, player] * ~BASES * alive[:, None]
+        self.battlefield[:, player] -= ships
+        self.discard[:, player] += ships + self.hand[:, player] * alive[:, None]
+        self.hand[alive, player] = 0
+        self.money[:, player] = 0
+        self.damage[:, player] = 0
+        self._draw(player, np.where(alive, events.HAND_SIZE, 0))
+
+    def take_turn(self, player: int) -> None:
+        alive = self.alive
+        opponent = (player + 1) % self._player_count
+
+        self._play(player, alive)
+        self._buy(player, alive)
+        self._attack(player, opponent)
+        self._clean_up(player, alive)
+
+        self.turns[alive] += 1
+        for index in range(self._player_count):
+            finished = self.alive & (self.influence[:, index] <= 0)
+            self.winners[finished] = (index + 1) % self._player_count
+
+    def run(self, max_turns: int) -> BatchResult:
+        for turn in range(max_turns):
+            if not self.alive.any():
+                break
+            self.take_turn(turn % self._player_count)
+        return BatchResult(self.winners, self.turns, self.influence)
+
+
+def simulate_batch(
+    games: int,
+    player_count: int = 2,
+    max_turns: int = 200,
+    seed: t.Optional[int] = None,
+) -> BatchResult:
+    return BatchSimulator(games, player_count, seed).run(max_turns)
+
+
+class Validation(t.NamedTuple):
+    engine_games: int
+    batch_games: int
+    engine_win_rate: float
+    batch_win_rate: float
+    engine_mean_turns: float
+    batch_mean_turns: float
+    win_rate_z: float
+    mean_turns_z: float
+
+    @property
+    def consistent(self) -> bool:
+        return abs(self.win_rate_z) < 3 and abs(self.mean_turns_z) < 3
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return dict(self._asdict(), consistent = self.consistent)
+
+
+def _z(mean_a: float, variance_a: float, n_a: int, mean_b: float, variance_b: float, n_b: int) -> float:
+    error = math.sqrt(variance_a / n_a + variance_b / n_b)
+    return (mean_a - mean_b) / error if error else 0.
+
+
+def validate(
+    engine_games: int = 200,
+    batch_games: int = 10000,
+    max_turns: int = 200,
+    seed: int = 0,
+) -> Validation:
+    first = create_signatures(2)[0].name
+    engine_results = list(play_games((GreedyPolicy, GreedyPolicy), engine_games, max_turns, seed))
+    engine_wins = np.array([result.winner == first for result in engine_results], dtype = float)
+    engine_turns = np.array([result.turns for result in engine_results], dtype = float)
+
+    batch = simulate_batch(batch_games, 2, max_turns, seed)
+    batch_wins = (batch.winners == 0).astype(float)
+    batch_turns = batch.turns.astype(float)
+
+    return Validation(
+        engine_games = engine_games,
+        batch_games = batch_games,
+        engine_win_rate = float(engine_wins.mean()),
+        batch_win_rate = float(batch_wins.mean()),
+        engine_mean_turns = float(engine_turns.mean()),
+        batch_mean_turns = float(batch_turns.mean()),
+        win_rate_z = _z(
+            engine_wins.mean(), engine_wins.var(ddof = 1), engine_games,
+            batch_wins.mean(), batch_wins.var(ddof = 1), batch_games,
+        ),
+        mean_turns_z = _z(
+            engine_turns.mean(), engine_turns.var(ddof = 1), engine_games,
+            batch_turns.mean(), batch_turns.var(ddof = 1), batch_games,
+        ),
+    )
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description = 'Validate the batch simulator against the event engine.')
+    parser.add_argument('--engine-games', type = int, default = 200)
+    parser.add_argument('--batch-games', type = int, default = 10000)
+    parser.add_argument('--max-turns', type = int, default = 200)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--output', type = argparse.FileType('w'), default = sys.stdout)
+    args = parser.parse_args(argv)
+
+    json.dump(
+        validate(args.engine_games, args.batch_games, args.max_turns, args.seed).as_dict(),
+        args.output,
+        indent = 4,
+    )
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+import typing as t
+
+from importlib import metadata
+
+from sunkingdoms import events
+from sunkingdoms.game.profiling import EventProfiler
+from sunkingdoms.livegame import LiveGame
+from sunkingdoms.simulation.interface import SKHeadlessInterface
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import create_game, run_game
+
+
+class BenchmarkResult(t.NamedTuple):
+    name: str
+    iterations: int
+    seconds: float
+    events: int
+    turns: int
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'iterations': self.iterations,
+            'seconds': self.seconds,
+            'iterations_per_second': self.iterations / self.seconds if self.seconds else None,
+            'events': self.events,
+            'events_per_second': self.events / self.seconds if self.seconds else None,
+            'turns': self.turns,
+            'turns_per_second': self.turns / self.seconds if self.seconds else None,
+        }
+
+
+class MemoryResult(t.NamedTuple):
+    games: int
+    setup_bytes: int
+    played_games: int
+    peak_bytes: int
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'games': self.games,
+            'setup_bytes_per_game': self.setup_bytes / self.games,
+            'played_games': self.played_games,
+            'peak_bytes_per_game': self.peak_bytes / self.played_games,
+        }
+
+
+def _create_game(seed: int) -> LiveGame:
+    return create_game([GreedyPolicy(seed), GreedyPolicy(seed + 1)], seed = seed)
+
+
+def _set_up_game(seed: int) -> LiveGame:
+    game = _create_game(seed)
+    game.resolve_event(events.SetupGame)
+    return game
+
+
+def _measure(
+    name: str,
+    interfaces: t.Sequence[SKHeadlessInterface],
+    run: t.Callable[[], int],
+) -> BenchmarkResult:
+    start_events = sum(interface.event_count for interface in interfaces)
+    start_turns = sum(interface.turns for interface in interfaces)
+    start_time = time.perf_counter()
+
+    iterations = run()
+
+    seconds = time.perf_counter() - start_time
+    return BenchmarkResult(
+        name,
+        iterations,
+        seconds,
+        sum(interface.event_count for interface in interfaces) - start_events,
+        sum(interface.turns for interface in interfaces) - start_turns,
+    )
+
+
+def benchmark_move_cardboard(iterations: int, seed: int) -> BenchmarkResult:
+    game = _set_up_game(seed)
+    player = next(iter(game.players.all))
+
+    def _run() -> int:
+        for _ in range(iterations):
+            cardboard = player.hand[-1]
+            game.resolve_event(
+                events.MoveCardboard,
+                player = player,
+                target = cardboard,
+                frm = player.hand,
+                to = player.discard_pile,
+            )
+            game.resolve_event(
+                events.MoveCardboard,
+                player = player,
+                target = cardboard,
+                frm = player.discard_pile,
+                to = player.hand,
+            )
+        return iterations * 2
+
+    return _measure('move_cardboard', (game.interface,), _run)
+
+
+def benchmark_draw_hand(iterations: int, seed: int) -> BenchmarkResult:
+    game = _set_up_game(seed)
+    player = next(iter(game.players.all))
+
+    def _run() -> int:
+        for _ in range(iterations):
+            for cardboard in player.hand.iter_copy():
+                game.resolve_event(events.DiscardCardboard, player = player, target = cardboard)
+            game.resolve_event(events.DrawHand, player = player)
+        return iterations
+
+    return _measure('draw_hand', (game.interface,), _run)
+
+
+def benchmark_take_turn(iterations: int, seed: int) -> BenchmarkResult:
+    game = _set_up_game(seed)
+    players = list(game.players.all)
+
+    def _run() -> int:
+        for index in range(iterations):
+            game.resolve_event(events.TakeTurn, player = players[index % len(players)])
+        return iterations
+
+    return _measure('take_turn', (game.interface,), _run)
+
+
+def benchmark_setup_game(iterations: int, seed: int) -> BenchmarkResult:
+    games = [_create_game(seed + index) for index in range(iterations)]
+
+    def _run() -> int:
+        for game in games:
+            game.resolve_event(events.SetupGame)
+        return iterations
+
+    return _measure('setup_game', [game.interface for game in games], _run)
+
+
+def benchmark_play_game(iterations: int, seed: int) -> BenchmarkResult:
+    games = [_create_game(seed + index) for index in range(iterations)]
+
+    def _run() -> int:
+        for index, game in enumerate(games):
+            run_game(game, seed + index)
+        return iterations
+
+    return _measure('play_game', [game.interface for game in games], _run)
+
+
+class _EventCollector(EventProfiler):
+
+    def __init__(self):
+        super().__init__()
+        self.events: t.List[events.SKGameEvent] = []
+
+    def event_started(self, event: events.SKGameEvent) -> None:
+        self.events.append(event)
+
+    def event_finished(self, event: events.SKGameEvent, success: bool) -> None:
+        pass
+
+
+def benchmark_serialize_event(iterations: int, seed: int) -> BenchmarkResult:
+    collector = _EventCollector()
+    game = _create_game(seed)
+    game.profiler = collector
+    run_game(game, seed)
+    game.profiler = None
+    codec = game.codec
+
+    def _run() -> int:
+        for index in range(iterations):
+            event = collector.events[index % len(collector.events)]
+            codec.decode(codec.encode(event))
+        return iterations
+
+    return _measure('serialize_event', (), _run)
+
+
+def measure_memory(games: int, played_games: int, seed: int) -> MemoryResult:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        set_up = [_set_up_game(seed + index) for index in range(games)]
+        gc.collect()
+        setup_bytes = tracemalloc.get_traced_memory()[0] - start
+        del set_up
+
+        peak_bytes = 0
+        for index in range(played_games):
+            gc.collect()
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            run_game(_create_game(seed + index), seed + index)
+            peak_bytes += tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+    return MemoryResult(games, setup_bytes, played_games, peak_bytes)
+
+
+# Runs this module's measure_memory against another checkout of the package, found first on sys.path
+# because the interpreter is started from the directory it was extracted to.
+_MEASURE_MEMORY = """
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location('_benchmark', sys.argv[1])
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+print(json.dumps(benchmark.measure_memory(*map(int, sys.argv[2:]))))
+"""
+
+
+def measure_memory_at(revision: str, games: int, played_games: int, seed: int) -> MemoryResult:
+    root = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'],
+        cwd = os.path.dirname(os.path.abspath(__file__)),
+        stdout = subprocess.PIPE,
+        text = True,
+        check = True,
+    ).stdout.strip()
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', revision, 'sunkingdoms'],
+        cwd = root,
+        stdout = subprocess.PIPE,
+        check = True,
+    ).stdout
+
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj = io.BytesIO(archive)) as tar:
+            tar.extractall(directory, filter = 'data')
+        output = subprocess.run(
+            [sys.executable, '-c', _MEASURE_MEMORY, os.path.abspath(__file__), str(games), str(played_games), str(seed)],
+            cwd = directory,
+            stdout = subprocess.PIPE,
+            text = True,
+            check = True,
+        ).stdout
+
+    return MemoryResult(*json.loads(output))
+
+
+def _memory_change(result: MemoryResult, baseline: MemoryResult) -> t.Dict[str, t.Optional[float]]:
+    current, previous = result.as_dict(), baseline.as_dict()
+    return {
+        key: current[key] / previous[key] - 1 if previous[key] else None
+        for key in
+        ('setup_bytes_per_game', 'peak_bytes_per_game')
+    }
+
+
+BENCHMARKS: t.Mapping[str, t.Tuple[t.Callable[[int, int], BenchmarkResult], int]] = {
+    'move_cardboard': (benchmark_move_cardboard, 20000),
+    'draw_hand': (benchmark_draw_hand, 2000),
+    'take_turn': (benchmark_take_turn, 500),
+    'setup_game': (benchmark_setup_game, 200),
+    'play_game': (benchmark_play_game, 20),
+    'serialize_event': (benchmark_serialize_event, 50000),
+}
+
+
+def _version(distribution: str) -> t.Optional[str]:
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def run_benchmarks(
+    names: t.Optional[t.Iterable[str]] = None,
+    seed: int = 0,
+    scale: float = 1.,
+    memory: bool = False,
+    baseline: t.Optional[str] = None,
+) -> t.Dict[str, t.Any]:
+    results = {
+        'versions': {
+            distribution: _version(distribution)
+            for distribution in
+            ('sunkingdoms', 'eventtree', 'gameframe', 'eventdispatch', 'yeetlong')
+        },
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'benchmarks': {
+            name: BENCHMARKS[name][0](max(1, int(BENCHMARKS[name][1] * scale)), seed).as_dict()
+            for name in
+            (BENCHMARKS.keys() if names is None else names)
+        },
+    }
+    if memory or baseline is not None:
+        games, played_games = max(1, int(50 * scale)), max(1, int(10 * scale))
+        result = measure_memory(games, played_games, seed)
+        results['memory'] = result.as_dict()
+        if baseline is not None:
+            _baseline = measure_memory_at(baseline, games, played_games, seed)
+            results['memory_baseline'] = dict(_baseline.as_dict(), revision = baseline)
+            results['memory_change'] = _memory_change(result, _baseline)
+    return results
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description = 'Benchmark sunkingdoms event resolution.')
+    parser.add_argument('benchmarks', nargs = '*', help = ', '.join(BENCHMARKS.keys()))
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--scale', type = float, default = 1.)
+    parser.add_argument('--memory', action = 'store_true', help = 'also measure per game memory footprint')
+    parser.add_argument(
+        '--baseline',
+        metavar = 'REVISION',
+        help = 'also measure memory footprint of the package at this git revision and report the change',
+    )
+    parser.add_argument('--output', type = argparse.FileType('w'), default = sys.stdout)
+    args = parser.parse_args(argv)
+
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name}')
+
+    json.dump(
+        run_benchmarks(
+            args.benchmarks or None,
+            seed = args.seed,
+            scale = args.scale,
+            memory = args.memory,
+            baseline = args.baseline,
+        ),
+        args.output,
+        indent = 4,
+    )
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
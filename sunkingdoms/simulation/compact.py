@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import random
+import typing as t
+
+from array import array
+from collections import defaultdict
+
+from eventtree.replaceevent import StaticAttributeModification
+
+from sunkingdoms import carddb, cards
+from sunkingdoms import events as e
+from sunkingdoms.artifacts.artifacts import Card, Cardboard
+from sunkingdoms.game.game import SKGame
+
+
+FACTIONS = carddb.FACTIONS
+ALL_FACTIONS = (1 << len(FACTIONS)) - 1
+
+MONEY, DAMAGE, INFLUENCE, DRAW = range(4)
+
+ALLY, FREE, SCRAP = range(3)
+
+Effects = t.Tuple[int, int, int, int]
+
+_EFFECT_FIELDS = {
+    e.AddMoney: MONEY,
+    e.AddDamage: DAMAGE,
+    e.GainInfluence: INFLUENCE,
+    e.DrawCardboards: DRAW,
+}
+
+
+class UnsupportedCard(Exception):
+    pass
+
+
+class _UnsupportedEffect(Exception):
+    pass
+
+
+class _EffectRecorder(object):
+
+    def __init__(self):
+        self._effects = [0, 0, 0, 0]
+
+    @property
+    def effects(self) -> Effects:
+        return tuple(self._effects)
+
+    def spawn_tree(self, event_type: t.Type[e.SKGameEvent], **kwargs) -> None:
+        if event_type not in _EFFECT_FIELDS or 'amount' not in kwargs:
+            raise _UnsupportedEffect(event_type)
+        self._effects[_EFFECT_FIELDS[event_type]] += kwargs['amount']
+
+    def __getattr__(self, item: str) -> t.Any:
+        raise _UnsupportedEffect(item)
+
+
+class _CardboardStub(object):
+
+    def create_condition(self, *args, **kwargs) -> None:
+        pass
+
+
+def _record(effect: t.Callable[[t.Any], None]) -> t.Optional[Effects]:
+    recorder = _EffectRecorder()
+    try:
+        effect(recorder)
+    except _UnsupportedEffect:
+        return None
+    return recorder.effects
+
+
+class CompactAction(t.NamedTuple):
+    kind: int
+    faction: int
+    requirement: int
+    effects: t.Optional[Effects]
+
+
+class CardEntry(t.NamedTuple):
+    card_type: t.Type[Card]
+    name: str
+    price: int
+    factions: int
+    allegiance: int
+    base: bool
+    health: int
+    outpost: bool
+    on_play: t.Optional[Effects]
+    actions: t.Tuple[CompactAction, ...]
+
+    @property
+    def supported(self) -> bool:
+        return self.on_play is not None and all(action.effects is not None for action in self.actions)
+
+
+def _compact_action(action: t.Any) -> CompactAction:
+    if isinstance(action, cards.AllyAction):
+        return CompactAction(ALLY, FACTIONS.index(action.faction), action.requirement, _record(action.do))
+    if isinstance(action, cards.ScrapAction):
+        return CompactAction(SCRAP, -1, 0, _record(action.do))
+    if isinstance(action, cards.FreeAction):
+        return CompactAction(FREE, -1, 0, _record(action.do))
+    return CompactAction(FREE, -1, 0, None)
+
+
+def _card_entry(card_type: t.Type[Card]) -> CardEntry:
+    card = card_type(_CardboardStub(), None)
+    _card_id = card_type.card_id
+    factions = carddb.FACTION_MASKS[_card_id]
+
+    allegiance = factions
+    bonus = getattr(card_type, 'FactionBonus', None)
+    if (
+        isinstance(bonus, type)
+        and issubclass(bonus, StaticAttributeModification)
+        and bonus.trigger == 'allegiance'
+    ):
+        allegiance = ALL_FACTIONS
+
+    return CardEntry(
+        card_type = card_type,
+        name = card_type.name,
+        price = carddb.PRICES[_card_id],
+        factions = factions,
+        allegiance = allegiance,
+        base = carddb.BASES[_card_id],
+        health = carddb.HEALTH[_card_id],
+        outpost = carddb.OUTPOSTS[_card_id],
+        on_play = _record(card.on_play),
+        actions = tuple(_compact_action(action) for action in card_type.action_definitions()),
+    )
+
+
+CARDS: t.Tuple[CardEntry, ...] = tuple(_card_entry(card_type) for card_type in carddb.CARD_TYPES)
+
+CARD_IDS: t.Mapping[t.Type[Card], int] = {
+    entry.card_type: card_id
+    for card_id, entry in
+    enumerate(CARDS)
+}
+
+
+def card_id(cardboard: Cardboard) -> int:
+    _card_id = cardboard.card.card_id
+    if _card_id is None or not CARDS[_card_id].supported:
+        raise UnsupportedCard(cardboard.card.name)
+    return _card_id
+
+
+class PlayerState(object):
+    __slots__ = ('library', 'hand', 'battlefield', 'exhausted', 'discard', 'resources')
+
+    def __init__(
+        self,
+        library: array,
+        hand: array,
+        battlefield: array,
+        exhausted: array,
+        discard: array,
+        resources: array,
+    ):
+        self.library = library
+        self.hand = hand
+        self.battlefield = battlefield
+        self.exhausted = exhausted
+        self.discard = discard
+        self.resources = resources
+
+    def copy(self) -> PlayerState:
+        return PlayerState(
+            array('B', self.library),
+            array('B', self.hand),
+            array('B', self.battlefield),
+            array('B', self.exhausted),
+            array('B', self.discard),
+            array('i', self.resources),
+        )
+
+
+class CompactState(object):
+    __slots__ = ('players', 'trade_deck', 'trade_row', 'scrap_pile')
+
+    def __init__(self, players: t.List[PlayerState], trade_deck: array, trade_row: array, scrap_pile: array):
+        self.players = players
+        self.trade_deck = trade_deck
+        self.trade_row = trade_row
+        self.scrap_pile = scrap_pile
+
+    def copy(self) -> CompactState:
+        return CompactState(
+            [player.copy() for player in self.players],
+            array('B', self.trade_deck),
+            array('B', self.trade_row),
+            array('B', self.scrap_pile),
+        )
+
+    @classmethod
+    def from_game(cls, game: SKGame) -> CompactState:
+        return cls(
+            [
+                PlayerState(
+                    array('B', map(card_id, player.library)),
+                    array('B', map(card_id, player.hand)),
+                    array('B', map(card_id, player.battlefield)),
+                    array('B', (cardboard.card.actions.exhausted for cardboard in player.battlefield)),
+                    array('B', map(card_id, player.discard_pile)),
+                    array('i', (player.money, player.damage, player.influence, 0)),
+                )
+                for player in
+                game.players.all
+            ],
+            array('B', map(card_id, game.trade_deck)),
+            array('B', map(card_id, game.trade_row)),
+            array('B', map(card_id, game.scrap_pile)),
+        )
+
+    def apply_to(self, game: SKGame) -> None:
+        in_play = {
+            cardboard
+            for player in
+            game.players.all
+            for cardboard in
+            player.battlefield
+        }
+        pool: t.DefaultDict[int, t.List[Cardboard]] = defaultdict(list)
+        for zone in game.zones:
+            for cardboard in zone:
+                pool[card_id(cardboard)].append(cardboard)
+                cardboard.card.actions.refresh()
+
+        def _take(card_ids: t.Iterable[int]) -> t.List[Cardboard]:
+            return [pool[_card_id].pop() for _card_id in card_ids]
+
+        game.trade_deck.restore(_take(self.trade_deck))
+        game.trade_row.restore(_take(self.trade_row))
+        game.scrap_pile.restore(_take(self.scrap_pile))
+
+        for player, state in zip(game.players.all, self.players):
+            player.library.restore(_take(state.library))
+            player.hand.restore(_take(state.hand))
+            player.discard_pile.restore(_take(state.discard))
+            battlefield = _take(state.battlefield)
+            player.battlefield.restore(battlefield)
+            for cardboard, exhausted in zip(battlefield, state.exhausted):
+                cardboard.card.actions.exhausted = exhausted
+            player.money = state.resources[MONEY]
+            player.damage = state.resources[DAMAGE]
+            player.influence = state.resources[INFLUENCE]
+
+        # The pool hands out any cardboard of the right card, so conditions connected in enter_play
+        # follow the cardboards that are actually in play afterwards.
+        for player in game.players.all:
+            for cardboard in player.battlefield:
+                if cardboard in in_play:
+                    in_play.discard(cardboard)
+                else:
+                    cardboard.card.enter_play(None)
+        for cardboard in in_play:
+            game.disconnect_sourced(cardboard, parent = None)
+
+    def winner(self) -> t.Optional[int]:
+        for index, player in enumerate(self.players):
+            if player.resources[INFLUENCE] <= 0:
+                return (index + 1) % len(self.players)
+        return None
+
+
+def _draw(player: PlayerState, amount: int, rng: random.Random) -> None:
+    for _ in range(amount):
+        if not player.library:
+            if not player.discard:
+                return
+            library = list(player.discard)
+            rng.shuffle(library)
+            player.library = array('B', library)
+            player.discard = array('B')
+        player.hand.append(player.library.pop())
+
+
+def _apply(player: PlayerState, effects: Effects, rng: random.Random) -> None:
+    player.resources[MONEY] += effects[MONEY]
+    player.resources[DAMAGE] += effects[DAMAGE]
+    player.resources[INFLUENCE] += effects[INFLUENCE]
+    if effects[DRAW]:
+        _draw(player, effects[DRAW], rng)
+
+
+def _allegiance(player: PlayerState) -> t.List[int]:
+    counts = [0] * len(FACTIONS)
+    for _card_id in player.battlefield:
+        mask = CARDS[_card_id].allegiance
+        for index in range(len(FACTIONS)):
+            if mask & 1 << index:
+                counts[index] += 1
+    return counts
+
+
+def _play_cards(player: PlayerState, rng: random.Random) -> None:
+    changed = True
+    while changed:
+        changed = False
+
+        while player.hand:
+            _card_id = player.hand.pop()
+            player.battlefield.append(_card_id)
+            player.exhausted.append(0)
+            _apply(player, CARDS[_card_id].on_play, rng)
+
+        allegiance = _allegiance(player)
+        for position, _card_id in enumerate(player.battlefield):
+            for index, action in enumerate(CARDS[_card_id].actions):
+                if (
+                    action.kind == SCRAP
+                    or player.exhausted[position] & 1 << index
+                    or action.kind == ALLY and allegiance[action.faction] < action.requirement
+                ):
+                    continue
+                player.exhausted[position] |= 1 << index
+                _apply(player, action.effects, rng)
+                changed = True
+
+
+def _buy_cards(state: CompactState, player: PlayerState) -> None:
+    while True:
+        best = None
+        for position, _card_id in enumerate(state.trade_row):
+            price = CARDS[_card_id].price
+            if price <= player.resources[MONEY] and (best is None or price > CARDS[state.trade_row[best]].price):
+                best = position
+        if best is None:
+            return
+
+        _card_id = state.trade_row[best]
+        player.resources[MONEY] -= CARDS[_card_id].price
+        player.discard.append(_card_id)
+        if state.trade_deck:
+            state.trade_row[best] = state.trade_deck.pop()
+        else:
+            del state.trade_row[best]
+
+
+def _outposts(player: PlayerState) -> t.List[int]:
+    return [
+        position
+        for position, _card_id in
+        enumerate(player.battlefield)
+        if CARDS[_card_id].outpost
+    ]
+
+
+def _destroy(player: PlayerState, position: int, to: array) -> None:
+    to.append(player.battlefield.pop(position))
+    del player.exhausted[position]
+
+
+def _attack(state: CompactState, player: PlayerState, opponent: PlayerState, rng: random.Random) -> None:
+    if not _outposts(opponent):
+        scraps = [
+            (position, action)
+            for position, _card_id in
+            enumerate(player.battlefield)
+            for action in
+            CARDS[_card_id].actions
+            if action.kind == SCRAP
+        ]
+        if (
+            scraps
+            and player.resources[DAMAGE] < opponent.resources[INFLUENCE]
+            <= player.resources[DAMAGE] + sum(action.effects[DAMAGE] for _, action in scraps)
+        ):
+            for position, action in reversed(scraps):
+                _destroy(player, position, state.scrap_pile)
+                _apply(player, action.effects, rng)
+
+    while player.resources[DAMAGE]:
+        outposts = _outposts(opponent)
+        if not outposts:
+            opponent.resources[INFLUENCE] -= player.resources[DAMAGE]
+            player.resources[DAMAGE] = 0
+            return
+
+        killable = [
+            position
+            for position in
+            outposts
+            if CARDS[opponent.battlefield[position]].health <= player.resources[DAMAGE]
+        ]
+        if not killable:
+            return
+
+        position = max(killable, key = lambda _position: CARDS[opponent.battlefield[_position]].health)
+        player.resources[DAMAGE] -= CARDS[opponent.battlefield[position]].health
+        _destroy(opponent, position, opponent.discard)
+
+
+def _clean_up(player: PlayerState, rng: random.Random) -> None:
+    bases = array('B')
+    for _card_id in player.battlefield:
+        if CARDS[_card_id].base:
+            bases.append(_card_id)
+        else:
+            player.discard.append(_card_id)
+    player.battlefield = bases
+    player.exhausted = array('B', bytes(len(bases)))
+
+    player.discard.extend(player.hand)
+    player.hand = array('B')
+
+    player.resources[MONEY] = 0
+    player.resources[DAMAGE] = 0
+    _draw(player, e.HAND_SIZE, rng)
+
+
+def play_turn(state: CompactState, index: int, rng: random.Random) -> None:
+    player = state.players[index]
+    _play_cards(player, rng)
+    _buy_cards(state, player)
+    _attack(state, player, state.players[(index + 1) % len(state.players)], rng)
+    _clean_up(player, rng)
+
+
+def rollout(state: CompactState, index: int, rng: random.Random, max_turns: int) -> t.Optional[int]:
+    for _ in range(max_turns):
+        winner = state.winner()
+        if winner is not None:
+            return winner
+        play_turn(state, index, rng)
+        index = (index + 1) % len(state.players)
+    return state.winner()
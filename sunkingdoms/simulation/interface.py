@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import typing as t
+
+from gameframe.connectioncontroller import ConnectionController
+from gameframe.events import GameEvent
+from gameframe.interface import GameInterface, Option, O
+from gameframe.signature import PlayerSignature
+
+from sunkingdoms.events import TakeTurn, GameFinished
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.simulation.policies import Policy
+
+
+class GameAborted(Exception):
+    pass
+
+
+class ChoiceRecorder(object):
+
+    def __init__(self):
+        self._choices: t.List[int] = []
+
+    @property
+    def choices(self) -> t.List[int]:
+        return self._choices
+
+    @classmethod
+    def _index(cls, options: t.Sequence[O], choice: O) -> int:
+        for index, option in enumerate(options):
+            if option is choice:
+                return index
+        raise ValueError('{} is not one of the offered options'.format(choice))
+
+    def record_option(self, options: t.Sequence[O], choice: O) -> None:
+        self._choices.append(self._index(options, choice))
+
+    def record_options(self, options: t.Sequence[O], choices: t.Sequence[O]) -> None:
+        self._choices.append(len(choices))
+        self._choices.extend(self._index(options, choice) for choice in choices)
+
+
+class SKHeadlessInterface(GameInterface):
+
+    def __init__(
+        self,
+        controller: ConnectionController,
+        policies: t.Mapping[PlayerSignature, Policy],
+        max_turns: t.Optional[int] = None,
+        recorder: t.Optional[ChoiceRecorder] = None,
+    ):
+        super().__init__(controller)
+        self._policies = policies
+        self._max_turns = max_turns
+        self._recorder = recorder
+
+        self._event_count = 0
+        self._turns = 0
+        self._winner: t.Optional[SKPlayer] = None
+
+    @property
+    def event_count(self) -> int:
+        return self._event_count
+
+    @property
+    def turns(self) -> int:
+        return self._turns
+
+    @property
+    def winner(self) -> t.Optional[SKPlayer]:
+        return self._winner
+
+    def select_option(self, player: SKPlayer, options: t.Iterable[O]) -> O:
+        options = list(options)
+        choice = self._policies[player.signature].select_option(player, options)
+        if self._recorder is not None:
+            self._recorder.record_option(options, choice)
+        return choice
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Iterable[O],
+        minimum: int = 0,
+        maximum: t.Optional[int] = None,
+    ) -> t.Iterable[O]:
+        options = list(options)
+        choices = self._policies[player.signature].select_options(player, options, minimum, maximum)
+        if self._recorder is not None:
+            self._recorder.record_options(options, choices)
+        return choices
+
+    def select_string(self, player: SKPlayer, prompt: str, options: t.Iterable[str]) -> str:
+        return self.select_option(
+            player,
+            [Option('select string', option) for option in options],
+        ).value
+
+    def notify_event_start(self, event: GameEvent) -> None:
+        self._event_count += 1
+        if isinstance(event, TakeTurn):
+            if self._max_turns is not None and self._turns >= self._max_turns:
+                raise GameAborted()
+            self._turns += 1
+        elif isinstance(event, GameFinished):
+            self._winner = event.winner
+
+    def notify_event_end(self, event: GameEvent, success: bool) -> None:
+        pass
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import random
+import time
+import typing as t
+
+from gameframe.interface import Option, O
+from gameframe.signature import PlayerSignature
+
+from sunkingdoms import events
+from sunkingdoms.game.game import SKGame
+from sunkingdoms.interface import SKDummyController
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.simulation import compact
+from sunkingdoms.simulation.interface import SKHeadlessInterface, ChoiceRecorder
+from sunkingdoms.simulation.policies import Policy, RandomPolicy
+from sunkingdoms.simulation.replay import GameLog, ReplayPolicy, ReplayDesync
+from sunkingdoms.simulation.runner import create_game, run_game
+
+
+OptionKey = t.Tuple[str, str]
+SearchResult = t.Dict[OptionKey, t.Tuple[int, float]]
+
+
+def option_key(option: Option) -> OptionKey:
+    return option.option_type, option.value
+
+
+class SearchStatistics(t.NamedTuple):
+    iterations: int
+    seconds: float
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds else 0.
+
+
+class _Node(object):
+
+    def __init__(self):
+        self.visits = 0
+        self.wins = 0.
+        self.children: t.Dict[OptionKey, _Node] = {}
+
+    def select(self, keys: t.Sequence[OptionKey], exploration: float, rng: random.Random) -> OptionKey:
+        unvisited = [key for key in keys if key not in self.children or not self.children[key].visits]
+        if unvisited:
+            return rng.choice(unvisited)
+
+        log_visits = math.log(self.visits or 1)
+        return max(
+            keys,
+            key = lambda key: (
+                self.children[key].wins / self.children[key].visits
+                + exploration * math.sqrt(log_visits / self.children[key].visits)
+            ),
+        )
+
+    def child(self, key: OptionKey) -> _Node:
+        try:
+            return self.children[key]
+        except KeyError:
+            node = self.children[key] = _Node()
+            return node
+
+
+class _TreePolicy(Policy):
+
+    def __init__(self, root: _Node, rollout_policy: Policy, exploration: float, rng: random.Random):
+        super().__init__()
+        self._node = root
+        self._rollout_policy = rollout_policy
+        self._exploration = exploration
+        self._random = rng
+        self._in_tree = True
+        self.path: t.List[t.Tuple[_Node, PlayerSignature]] = []
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        if not self._in_tree or not all(isinstance(option, events.Move) for option in options):
+            return self._rollout_policy.select_option(player, options)
+
+        keyed: t.Dict[OptionKey, O] = {}
+        for option in options:
+            keyed.setdefault(option_key(option), option)
+
+        key = self._node.select(list(keyed), self._exploration, self._random)
+        self._node = self._node.child(key)
+        self.path.append((self._node, player.signature))
+        if not self._node.visits:
+            self._in_tree = False
+
+        return keyed[key]
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        return self._rollout_policy.select_options(player, options, minimum, maximum)
+
+
+class _SearchComplete(Exception):
+
+    def __init__(self, result: SearchResult, statistics: SearchStatistics):
+        super().__init__()
+        self.result = result
+        self.statistics = statistics
+
+
+class _ResumePolicy(ReplayPolicy):
+
+    def __init__(self, choices: t.Sequence[int], search_policy: MCTSPolicy):
+        super().__init__(choices)
+        self._search_policy = search_policy
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        if self.finished:
+            raise _SearchComplete(*self._search_policy.search(player, options))
+        return super().select_option(player, options)
+
+
+def _search_job(job: t.Tuple[GameLog, t.Mapping[str, t.Any]]) -> t.Tuple[SearchResult, SearchStatistics]:
+    log, config = job
+    policy = _ResumePolicy(log.choices, MCTSPolicy(**config))
+    try:
+        run_game(create_game([policy] * log.player_count, seed = log.seed), log.seed)
+    except _SearchComplete as complete:
+        return complete.result, complete.statistics
+    raise ReplayDesync('game ended before the searched decision')
+
+
+class MCTSPolicy(Policy):
+
+    def __init__(
+        self,
+        seed: t.Optional[int] = None,
+        iterations: t.Optional[int] = 1000,
+        time_limit: t.Optional[float] = None,
+        exploration: float = math.sqrt(2),
+        rollout_policy_type: t.Callable[[t.Optional[int]], Policy] = RandomPolicy,
+        max_rollout_turns: int = 20,
+        processes: int = 1,
+        recorder: t.Optional[ChoiceRecorder] = None,
+        compact_rollouts: bool = False,
+    ):
+        super().__init__(seed)
+        if iterations is None and time_limit is None:
+            raise ValueError('MCTSPolicy needs an iteration or time budget')
+        if processes > 1 and recorder is None:
+            raise ValueError('parallel search replays the game, so it needs the recorder of the game')
+
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._rollout_policy_type = rollout_policy_type
+        self._rollout_policy = rollout_policy_type(self._random.getrandbits(32))
+        self._max_rollout_turns = max_rollout_turns
+        self._processes = processes
+        self._recorder = recorder
+        self._compact_rollouts = compact_rollouts
+
+        self._pool = None
+        self._searching = False
+        self._statistics = SearchStatistics(0, 0.)
+        self._last_statistics = SearchStatistics(0, 0.)
+
+    @property
+    def statistics(self) -> SearchStatistics:
+        return self._statistics
+
+    @property
+    def last_statistics(self) -> SearchStatistics:
+        return self._last_statistics
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _determinize(self, game: SKGame, player: SKPlayer) -> None:
+        game.random.seed(self._random.getrandbits(32))
+        game.trade_deck.shuffle()
+        player.library.shuffle()
+        for other in game.players.all:
+            if other == player:
+                continue
+            hidden = list(other.hand) + list(other.library)
+            self._random.shuffle(hidden)
+            other.hand.restore(hidden[:len(other.hand)])
+            other.library.restore(hidden[len(other.hand):])
+
+    def _rewards(self, game: SKGame) -> t.Dict[PlayerSignature, float]:
+        winner = events.find_winner(game)
+        if winner is not None:
+            return {
+                player.signature: 1. if player == winner else 0.
+                for player in
+                game.players.all
+            }
+        total = sum(max(player.influence, 0) for player in game.players.all) or 1
+        return {
+            player.signature: max(player.influence, 0) / total
+            for player in
+            game.players.all
+        }
+
+    def _compact_rewards(self, game: SKGame, player: SKPlayer) -> t.Dict[PlayerSignature, float]:
+        state = compact.CompactState.from_game(game)
+        players = list(game.players.all)
+        winner = compact.rollout(
+            state,
+            (players.index(player) + 1) % len(players),
+            self._random,
+            self._max_rollout_turns,
+        )
+        if winner is not None:
+            return {
+                _player.signature: 1. if index == winner else 0.
+                for index, _player in
+                enumerate(players)
+            }
+        influences = [max(_state.resources[compact.INFLUENCE], 0) for _state in state.players]
+        total = sum(influences) or 1
+        return {
+            _player.signature: influence / total
+            for _player, influence in
+            zip(players, influences)
+        }
+
+    def _simulate(self, game: SKGame, player: SKPlayer) -> t.Dict[PlayerSignature, float]:
+        # Searches run from inside the decision of the active TakeTurn. The rest of that turn is played
+        # from the same event, so its turn scoped conditions stay in effect, and the rollout continues
+        # with child turns starting at the opponent.
+        turn = game.turn
+        turn.take_actions()
+        turn.end_turn()
+        if self._compact_rollouts:
+            try:
+                return self._compact_rewards(game, player)
+            except compact.UnsupportedCard:
+                pass
+        for _ in range(self._max_rollout_turns):
+            if events.find_winner(game) is not None:
+                break
+            player = player.opponent
+            turn.spawn_tree(events.TakeTurn, player = player)
+        return self._rewards(game)
+
+    def search(self, player: SKPlayer, options: t.Sequence[O]) -> t.Tuple[SearchResult, SearchStatistics]:
+        if self._searching:
+            raise RuntimeError('search is not re-entrant')
+        game: SKGame = player.game
+        if game.turn is None or game.turn.player != player:
+            raise RuntimeError('search needs the active turn of {}'.format(player.signature.name))
+        root = _Node()
+        snapshot = game.snapshot()
+        signatures = [_player.signature for _player in game.players.all]
+        controller = SKDummyController(signatures)
+        deadline = None if self._time_limit is None else time.perf_counter() + self._time_limit
+        iterations = 0
+        started = time.perf_counter()
+
+        self._searching = True
+        try:
+            while (
+                (self._iterations is None or iterations < self._iterations)
+                and (deadline is None or time.perf_counter() < deadline)
+            ):
+                tree_policy = _TreePolicy(root, self._rollout_policy, self._exploration, self._random)
+                interface = SKHeadlessInterface(
+                    controller,
+                    {signature: tree_policy for signature in signatures},
+                )
+                with game.detached(interface):
+                    self._determinize(game, player)
+                    rewards = self._simulate(game, player)
+                    game.restore(snapshot)
+
+                root.visits += 1
+                for node, signature in tree_policy.path:
+                    node.visits += 1
+                    node.wins += rewards[signature]
+                iterations += 1
+        finally:
+            self._searching = False
+            game.restore(snapshot)
+
+        available = {option_key(option) for option in options}
+        return (
+            {
+                key: (node.visits, node.wins)
+                for key, node in
+                root.children.items()
+                if key in available
+            },
+            SearchStatistics(iterations, time.perf_counter() - started),
+        )
+
+    def _parallel_search(self, player: SKPlayer, options: t.Sequence[O]) -> t.Tuple[SearchResult, SearchStatistics]:
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self._processes)
+
+        log = GameLog(player.game.seed, len(list(player.game.players.all)), list(self._recorder.choices))
+        started = time.perf_counter()
+        result: SearchResult = {}
+        iterations = 0
+
+        for _result, statistics in self._pool.imap_unordered(
+            _search_job,
+            (
+                (
+                    log,
+                    {
+                        'seed': self._random.getrandbits(32),
+                        'iterations': (
+                            None if self._iterations is None else
+                            -(-self._iterations // self._processes)
+                        ),
+                        'time_limit': self._time_limit,
+                        'exploration': self._exploration,
+                        'rollout_policy_type': self._rollout_policy_type,
+                        'max_rollout_turns': self._max_rollout_turns,
+                        'compact_rollouts': self._compact_rollouts,
+                    },
+                )
+                for _ in
+                range(self._processes)
+            ),
+        ):
+            iterations += statistics.iterations
+            for key, (visits, wins) in _result.items():
+                _visits, _wins = result.get(key, (0, 0.))
+                result[key] = (_visits + visits, _wins + wins)
+
+        return result, SearchStatistics(iterations, time.perf_counter() - started)
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        if (
+            len(options) == 1
+            or not all(isinstance(option, events.Move) for option in options)
+        ):
+            return self._rollout_policy.select_option(player, options)
+
+        if self._processes > 1:
+            result, statistics = self._parallel_search(player, options)
+        else:
+            result, statistics = self.search(player, options)
+
+        self._last_statistics = statistics
+        self._statistics = SearchStatistics(
+            self._statistics.iterations + statistics.iterations,
+            self._statistics.seconds + statistics.seconds,
+        )
+
+        if not result:
+            return self._rollout_policy.select_option(player, options)
+
+        best = max(result, key = lambda key: result[key][0])
+        for option in options:
+            if option_key(option) == best:
+                return option
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        return self._rollout_policy.select_options(player, options, minimum, maximum)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import multiprocessing
+import typing as t
+
+from sunkingdoms.simulation.policies import Policy
+from sunkingdoms.simulation.runner import GameResult, game_seeds, play_seeded_game
+
+
+def _play_job(job: t.Tuple[t.Sequence[t.Callable[[int], Policy]], int, t.Optional[int]]) -> GameResult:
+    return play_seeded_game(*job)
+
+
+def simulate(
+    policy_types: t.Sequence[t.Callable[[int], Policy]],
+    amount: int,
+    seed: int = 0,
+    max_turns: t.Optional[int] = None,
+    processes: t.Optional[int] = None,
+    chunk_size: t.Optional[int] = None,
+) -> t.Iterator[GameResult]:
+    processes = processes or multiprocessing.cpu_count()
+    if chunk_size is None:
+        chunk_size = max(1, amount // (processes * 8))
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(
+            _play_job,
+            (
+                (policy_types, game_seed, max_turns)
+                for game_seed in
+                game_seeds(seed, amount)
+            ),
+            chunksize = chunk_size,
+        )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import random
+import typing as t
+
+from abc import ABC, abstractmethod
+
+from gameframe.interface import Option, O
+
+from sunkingdoms import carddb
+from sunkingdoms.artifacts.artifacts import Cardboard
+from sunkingdoms.players.interface import SKPlayer
+
+
+class Policy(ABC):
+
+    def __init__(self, seed: t.Optional[int] = None):
+        self._random = random.Random(seed)
+
+    @abstractmethod
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        pass
+
+    @abstractmethod
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        pass
+
+
+class RandomPolicy(Policy):
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        return self._random.choice(options)
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        return self._random.sample(
+            options,
+            self._random.randint(
+                minimum,
+                len(options) if maximum is None else min(maximum, len(options)),
+            ),
+        )
+
+
+class GreedyPolicy(Policy):
+    _priorities = {
+        'play card': 0,
+        'activate cardboard': 1,
+        'buy card': 2,
+        'attack': 3,
+        'pass turn': 4,
+    }
+
+    @classmethod
+    def _value(cls, option: Option) -> int:
+        item = option.item
+        if not isinstance(item, Cardboard):
+            return 0
+        if option.option_type == 'buy card':
+            return carddb.price(item.card)
+        if option.option_type == 'attack':
+            return carddb.health(item.card)
+        return 0
+
+    @classmethod
+    def _key(cls, option: Option) -> t.Tuple[int, int]:
+        return cls._priorities.get(option.option_type, len(cls._priorities)), -cls._value(option)
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        return min(options, key = self._key)
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        return list(options[:minimum])
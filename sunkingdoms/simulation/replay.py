@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+import typing as t
+
+from gameframe.interface import O
+
+from sunkingdoms.players.interface import SKPlayer
+from sunkingdoms.serialization import read_varint, write_varint, zigzag, unzigzag
+from sunkingdoms.simulation.interface import ChoiceRecorder
+from sunkingdoms.simulation.policies import Policy
+from sunkingdoms.simulation.runner import GameResult, create_game, run_game
+
+
+class ReplayDesync(Exception):
+    pass
+
+
+class GameLog(t.NamedTuple):
+    seed: t.Optional[int]
+    player_count: int
+    choices: t.Sequence[int]
+
+
+_MAGIC = b'SKG'
+_VERSION = 1
+_HAS_SEED = 1
+
+
+def encode_log(log: GameLog) -> bytes:
+    buffer = bytearray(_MAGIC)
+    buffer.append(_VERSION)
+    buffer.append(_HAS_SEED if log.seed is not None else 0)
+    write_varint(buffer, log.player_count)
+    if log.seed is not None:
+        write_varint(buffer, zigzag(log.seed))
+    write_varint(buffer, len(log.choices))
+    for choice in log.choices:
+        write_varint(buffer, choice)
+    return bytes(buffer)
+
+
+def decode_log(data: bytes) -> GameLog:
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError('not a game log')
+    if data[len(_MAGIC)] != _VERSION:
+        raise ValueError('unsupported game log version {}'.format(data[len(_MAGIC)]))
+
+    flags = data[len(_MAGIC) + 1]
+    position = len(_MAGIC) + 2
+    player_count, position = read_varint(data, position)
+
+    seed = None
+    if flags & _HAS_SEED:
+        encoded_seed, position = read_varint(data, position)
+        seed = unzigzag(encoded_seed)
+
+    amount, position = read_varint(data, position)
+    choices = []
+    for _ in range(amount):
+        choice, position = read_varint(data, position)
+        choices.append(choice)
+
+    return GameLog(seed, player_count, choices)
+
+
+def write_logs(f: t.BinaryIO, logs: t.Iterable[GameLog]) -> None:
+    for log in logs:
+        encoded = encode_log(log)
+        header = bytearray()
+        write_varint(header, len(encoded))
+        f.write(header)
+        f.write(encoded)
+
+
+def read_logs(f: t.BinaryIO) -> t.Iterator[GameLog]:
+    data = f.read()
+    position = 0
+    while position < len(data):
+        length, position = read_varint(data, position)
+        yield decode_log(data[position:position + length])
+        position += length
+
+
+class ReplayPolicy(Policy):
+
+    def __init__(self, choices: t.Sequence[int]):
+        super().__init__()
+        self._choices = choices
+        self._position = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._position >= len(self._choices)
+
+    def _next(self, limit: int) -> int:
+        if self.finished:
+            raise ReplayDesync('log exhausted after {} choices'.format(self._position))
+        choice = self._choices[self._position]
+        if choice >= limit:
+            raise ReplayDesync(
+                'choice {} at position {} out of range for {} options'.format(choice, self._position, limit)
+            )
+        self._position += 1
+        return choice
+
+    def select_option(self, player: SKPlayer, options: t.Sequence[O]) -> O:
+        return options[self._next(len(options))]
+
+    def select_options(
+        self,
+        player: SKPlayer,
+        options: t.Sequence[O],
+        minimum: int,
+        maximum: t.Optional[int],
+    ) -> t.List[O]:
+        amount = self._next(len(options) + 1)
+        indices = [self._next(len(options)) for _ in range(amount)]
+        if len(set(indices)) != len(indices):
+            raise ReplayDesync('duplicate choices {} before position {}'.format(indices, self._position))
+        return [options[index] for index in indices]
+
+
+def record_game(
+    policies: t.Sequence[Policy],
+    max_turns: t.Optional[int] = None,
+    seed: t.Optional[int] = None,
+) -> t.Tuple[GameResult, GameLog]:
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    recorder = ChoiceRecorder()
+    result = run_game(
+        create_game(policies, max_turns = max_turns, seed = seed, recorder = recorder),
+        seed,
+    )
+    return result, GameLog(seed, len(policies), recorder.choices)
+
+
+def replay_game(log: GameLog, max_turns: t.Optional[int] = None) -> GameResult:
+    if log.seed is None:
+        raise ReplayDesync('game log has no seed and cannot be reproduced')
+    policy = ReplayPolicy(log.choices)
+    result = run_game(
+        create_game([policy] * log.player_count, max_turns = max_turns, seed = log.seed),
+        log.seed,
+    )
+    if not policy.finished:
+        raise ReplayDesync('game ended with unused choices in log')
+    return result
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import random
+import typing as t
+
+from sunkingdoms.game.profiling import EventProfiler
+from sunkingdoms.interface import SKDummyController
+from sunkingdoms.livegame import LiveGame
+from sunkingdoms.setup import SKSetup
+from sunkingdoms.signatures import SKPlayerSignature
+from sunkingdoms.simulation.interface import SKHeadlessInterface, GameAborted, ChoiceRecorder
+from sunkingdoms.simulation.policies import Policy
+
+
+class GameResult(t.NamedTuple):
+    seed: t.Optional[int]
+    winner: t.Optional[str]
+    turns: int
+    influence: t.Tuple[int, ...]
+
+
+def create_signatures(player_count: int) -> t.Tuple[SKPlayerSignature, ...]:
+    return tuple(
+        SKPlayerSignature(f'player {i + 1}')
+        for i in
+        range(player_count)
+    )
+
+
+def create_game(
+    policies: t.Sequence[Policy],
+    max_turns: t.Optional[int] = None,
+    seed: t.Optional[int] = None,
+    recorder: t.Optional[ChoiceRecorder] = None,
+    profiler: t.Optional[EventProfiler] = None,
+    fast_events: bool = False,
+) -> LiveGame:
+    signatures = create_signatures(len(policies))
+    game = LiveGame(
+        SKSetup(len(signatures), seed = seed),
+        SKHeadlessInterface(
+            SKDummyController(signatures),
+            dict(zip(signatures, policies)),
+            max_turns = max_turns,
+            recorder = recorder,
+        ),
+        signatures,
+    )
+    game.profiler = profiler
+    game.fast_events = fast_events
+    return game
+
+
+def run_game(game: LiveGame, seed: t.Optional[int] = None) -> GameResult:
+    interface: SKHeadlessInterface = game.interface
+
+    try:
+        game.start()
+    except GameAborted:
+        if game.profiler is not None:
+            game.profiler.abandon()
+
+    return GameResult(
+        seed = seed,
+        winner = None if interface.winner is None else interface.winner.signature.name,
+        turns = interface.turns,
+        influence = tuple(player.influence for player in game.players.all),
+    )
+
+
+def play_game(
+    policies: t.Sequence[Policy],
+    max_turns: t.Optional[int] = None,
+    seed: t.Optional[int] = None,
+    recorder: t.Optional[ChoiceRecorder] = None,
+    profiler: t.Optional[EventProfiler] = None,
+) -> GameResult:
+    return run_game(
+        create_game(policies, max_turns = max_turns, seed = seed, recorder = recorder, profiler = profiler),
+        seed,
+    )
+
+
+def game_seeds(seed: int, amount: int) -> t.Iterator[int]:
+    # Drawn rather than counted up from seed, so batches with different seeds do not share games.
+    _random = random.Random(seed)
+    for _ in range(amount):
+        yield _random.getrandbits(63)
+
+
+def play_seeded_game(
+    policy_types: t.Sequence[t.Callable[[int], Policy]],
+    seed: int,
+    max_turns: t.Optional[int] = None,
+    profiler: t.Optional[EventProfiler] = None,
+) -> GameResult:
+    return play_game(
+        [
+            policy_type(seed * len(policy_types) + index)
+            for index, policy_type in
+            enumerate(policy_types)
+        ],
+        max_turns = max_turns,
+        seed = seed,
+        profiler = profiler,
+    )
+
+
+def play_games(
+    policy_types: t.Sequence[t.Callable[[int], Policy]],
+    amount: int,
+    max_turns: t.Optional[int] = None,
+    seed: int = 0,
+    profiler: t.Optional[EventProfiler] = None,
+) -> t.Iterator[GameResult]:
+    for game_seed in game_seeds(seed, amount):
+        yield play_seeded_game(policy_types, game_seed, max_turns, profiler)
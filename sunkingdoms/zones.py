@@ -6,17 +6,20 @@ from sunkingdoms.artifacts.artifact import GameArtifact
 
 
 class Zoneable(GameArtifact):
-    pass
+    __slots__ = ()
+
+    name: str
 
 
 class ZoneOwner(object):
-    pass
+    __slots__ = ()
 
 
 Z = t.TypeVar('Z', bound = Zoneable)
 
 
 class Zone(t.Generic[Z]):
+    __slots__ = ('_name', '_ordered', '_private', '_face_up', '_owner', '_random', '_cardboards', '_version', '_id')
 
     def __init__(
         self,
@@ -25,14 +28,18 @@ class Zone(t.Generic[Z]):
         private: bool,
         face_up: bool,
         owner: t.Optional[ZoneOwner] = None,
+        rng: t.Optional[random.Random] = None,
     ):
         self._name = name
         self._ordered = ordered
         self._private = private
         self._face_up = face_up
         self._owner = owner
+        self._random = random.Random() if rng is None else rng
 
         self._cardboards: t.List[Z] = []
+        self._version = 0
+        self._id: t.Optional[int] = None
 
     @property
     def name(self) -> str:
@@ -42,8 +49,35 @@ class Zone(t.Generic[Z]):
     def owner(self) -> t.Optional[ZoneOwner]:
         return self._owner
 
+    @property
+    def ordered(self) -> bool:
+        return self._ordered
+
+    @property
+    def private(self) -> bool:
+        return self._private
+
+    @property
+    def face_up(self) -> bool:
+        return self._face_up
+
+    @property
+    def id(self) -> t.Optional[int]:
+        return self._id
+
+    @id.setter
+    def id(self, zone_id: int) -> None:
+        if self._id is not None and self._id != zone_id:
+            raise ValueError('zone {} already has id {}'.format(self._name, self._id))
+        self._id = zone_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
     def leave(self, cardboard: Z) -> None:
         self._cardboards.remove(cardboard)
+        self._version += 1
 
     def join(self, cardboard: Z, index: t.Optional[int] = None) -> None:
         if cardboard.zone is not None:
@@ -53,16 +87,47 @@ class Zone(t.Generic[Z]):
             self._cardboards.append(cardboard)
         else:
             self._cardboards.insert(index, cardboard)
+        self._version += 1
+
+    def leave_many(self, cardboards: t.Collection[Z]) -> None:
+        if len(cardboards) == len(self._cardboards):
+            self._cardboards.clear()
+        else:
+            leaving = set(cardboards)
+            self._cardboards[:] = [cardboard for cardboard in self._cardboards if cardboard not in leaving]
+        self._version += 1
+
+    def join_many(self, cardboards: t.Sequence[Z], index: t.Optional[int] = None) -> None:
+        leaving: t.Dict[Zone, t.List[Z]] = {}
+        for cardboard in cardboards:
+            if cardboard.zone is not None:
+                leaving.setdefault(cardboard.zone, []).append(cardboard)
+        for zone, _cardboards in leaving.items():
+            zone.leave_many(_cardboards)
+        for cardboard in cardboards:
+            cardboard._zone = self
+        if index is None:
+            self._cardboards.extend(cardboards)
+        else:
+            self._cardboards[index:index] = cardboards
+        self._version += 1
 
     def shuffle(self, to: t.Optional[int] = None) -> None:
+        self._version += 1
         if to is None:
-            random.shuffle(self._cardboards)
+            self._random.shuffle(self._cardboards)
         else:
-            self._cardboards[:to] = random.sample(
+            self._cardboards[:to] = self._random.sample(
                 self._cardboards[:to],
                 to if to >= 0 else len(self._cardboards) + to
             )
 
+    def restore(self, cardboards: t.Iterable[Z]) -> None:
+        self._cardboards[:] = cardboards
+        for cardboard in self._cardboards:
+            cardboard._zone = self
+        self._version += 1
+
     def iter_copy(self) -> t.Iterator[Z]:
         return copy.copy(self._cardboards).__iter__()
 
@@ -90,3 +155,88 @@ class Zone(t.Generic[Z]):
     @property
     def cards(self) -> t.MutableSequence[Z]:
         return self._cardboards
+
+
+class IndexedZone(Zone[Z]):
+    __slots__ = ('_positions', '_counts')
+
+    def __init__(
+        self,
+        name: str,
+        ordered: bool,
+        private: bool,
+        face_up: bool,
+        owner: t.Optional[ZoneOwner] = None,
+        rng: t.Optional[random.Random] = None,
+    ):
+        super().__init__(name, ordered, private, face_up, owner, rng)
+        self._positions: t.Dict[Z, int] = {}
+        self._counts: t.Dict[str, int] = {}
+
+    def _reindex(self, start: int = 0) -> None:
+        for position in range(start, len(self._cardboards)):
+            self._positions[self._cardboards[position]] = position
+
+    def leave(self, cardboard: Z) -> None:
+        position = self._positions.pop(cardboard)
+        if position == len(self._cardboards) - 1:
+            self._cardboards.pop()
+        elif self._ordered:
+            del self._cardboards[position]
+            self._reindex(position)
+        else:
+            last = self._cardboards.pop()
+            self._cardboards[position] = last
+            self._positions[last] = position
+        self._version += 1
+
+        if self._counts[cardboard.name] == 1:
+            del self._counts[cardboard.name]
+        else:
+            self._counts[cardboard.name] -= 1
+
+    def join(self, cardboard: Z, index: t.Optional[int] = None) -> None:
+        super().join(cardboard, index)
+        if index is None:
+            self._positions[cardboard] = len(self._cardboards) - 1
+        else:
+            self._reindex(min(index, len(self._cardboards) - 1) if index >= 0 else 0)
+        self._counts[cardboard.name] = self._counts.get(cardboard.name, 0) + 1
+
+    def leave_many(self, cardboards: t.Collection[Z]) -> None:
+        super().leave_many(cardboards)
+        for cardboard in cardboards:
+            del self._positions[cardboard]
+            if self._counts[cardboard.name] == 1:
+                del self._counts[cardboard.name]
+            else:
+                self._counts[cardboard.name] -= 1
+        self._reindex()
+
+    def join_many(self, cardboards: t.Sequence[Z], index: t.Optional[int] = None) -> None:
+        super().join_many(cardboards, index)
+        self._reindex(0 if index is not None else len(self._cardboards) - len(cardboards))
+        for cardboard in cardboards:
+            self._counts[cardboard.name] = self._counts.get(cardboard.name, 0) + 1
+
+    def shuffle(self, to: t.Optional[int] = None) -> None:
+        super().shuffle(to)
+        self._reindex()
+
+    def restore(self, cardboards: t.Iterable[Z]) -> None:
+        super().restore(cardboards)
+        self._positions.clear()
+        self._reindex()
+        self._counts.clear()
+        for cardboard in self._cardboards:
+            self._counts[cardboard.name] = self._counts.get(cardboard.name, 0) + 1
+
+    def count(self, name: str) -> int:
+        return self._counts.get(name, 0)
+
+    @property
+    def composition(self) -> t.Mapping[str, int]:
+        return self._counts
+
+    def __contains__(self, item: Z) -> bool:
+        return item in self._positions
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms import carddb, cards
+from sunkingdoms.artifacts.artifacts import Price
+
+
+def test_registered_cards_have_table_entries():
+    for card_id, card_type in enumerate(carddb.CARD_TYPES):
+        assert card_type.card_id == card_id
+        assert carddb.PRICES[card_id] == card_type.price.amount
+        assert carddb.HEALTH[card_id] == card_type.health
+    assert carddb.PRICES[cards.RecyclingStation.card_id] == 4
+    assert carddb.PRICES[cards.MechWorld.card_id] == 5
+
+
+def test_unregistered_subclass_falls_back_to_attributes():
+    class ExpensiveCutter(cards.Cutter):
+        __slots__ = ()
+
+        name = 'Expensive Cutter'
+        price = Price(9)
+
+    assert ExpensiveCutter.card_id is None
+    assert cards.Cutter.card_id is not None
+    card = ExpensiveCutter.__new__(ExpensiveCutter)
+    assert carddb.price(card) == 9
+    assert carddb.health(card) == 0
+    assert not carddb.is_base(card)
+
+
+def test_register_rejects_int_price():
+    class Broken(cards.Cutter):
+        __slots__ = ()
+
+        name = 'Broken'
+        price = 3
+
+    with pytest.raises(carddb.InvalidCard):
+        carddb.register(Broken)
+    assert Broken.card_id is None
+
+
+def test_register_twice_is_rejected():
+    with pytest.raises(carddb.InvalidCard):
+        carddb.register(cards.Cutter)
@@ -0,0 +1,84 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms import cards, events
+from sunkingdoms.artifacts.artifacts import Faction
+from sunkingdoms.simulation.compact import CARD_IDS, CompactState, MONEY, DAMAGE, INFLUENCE, DRAW
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import create_game
+
+
+def _set_up_game(seed: int = 0):
+    game = create_game([GreedyPolicy(seed), GreedyPolicy(seed + 1)], seed = seed)
+    game.resolve_event(events.SetupGame)
+    return game
+
+
+def test_resources_round_trip():
+    game = _set_up_game()
+    first, second = game.players.all
+    first.money, first.damage, first.influence = 3, 2, 41
+    second.money, second.damage, second.influence = 7, 5, 13
+
+    state = CompactState.from_game(game)
+    assert tuple(state.players[0].resources) == (3, 2, 41, 0)
+    assert state.players[0].resources[MONEY] == 3
+    assert state.players[0].resources[DAMAGE] == 2
+    assert state.players[0].resources[INFLUENCE] == 41
+    assert state.players[0].resources[DRAW] == 0
+    assert state.players[1].resources[INFLUENCE] == 13
+    assert state.winner() is None
+
+    for player in game.players.all:
+        player.money, player.damage, player.influence = 0, 0, 50
+
+    state.apply_to(game)
+    assert (first.money, first.damage, first.influence) == (3, 2, 41)
+    assert (second.money, second.damage, second.influence) == (7, 5, 13)
+
+
+def test_winner_from_influence():
+    game = _set_up_game()
+    first, second = game.players.all
+    first.influence = 0
+    second.damage = 0
+
+    assert CompactState.from_game(game).winner() == 1
+
+
+def _faction_bonuses(game):
+    return [
+        spec
+        for spec in
+        game.condition_index.specs
+        if spec.condition_type is cards.MechWorld.FactionBonus
+    ]
+
+
+def test_mech_world_bonus_follows_battlefield():
+    game = _set_up_game()
+    first = next(iter(game.players.all))
+    before = CompactState.from_game(game)
+    assert Faction.YELLOW not in first.allegiance
+
+    mech_world = CARD_IDS[cards.MechWorld]
+    state = before.copy()
+    player = state.players[0]
+    zone = player.library if mech_world in player.library else player.hand
+    zone.remove(mech_world)
+    player.battlefield.append(mech_world)
+    player.exhausted.append(0)
+
+    state.apply_to(game)
+    assert [cardboard.card.card_id for cardboard in first.battlefield] == [mech_world]
+    assert Faction.YELLOW in first.allegiance
+    bonuses = _faction_bonuses(game)
+    assert len(bonuses) == 1
+    assert bonuses[0].kwargs['source'] is first.battlefield[0]
+
+    before.apply_to(game)
+    assert not first.battlefield
+    assert Faction.YELLOW not in first.allegiance
+    assert not _faction_bonuses(game)
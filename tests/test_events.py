@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms import events
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import create_game, run_game
+
+
+class _CheckedPolicy(GreedyPolicy):
+
+    def __init__(self, seed: int):
+        super().__init__(seed)
+        self.decisions = 0
+
+    def select_option(self, player, options):
+        if all(isinstance(option, events.Move) for option in options):
+            fresh = events.LegalMoves(player.game.turn).moves
+            assert [option.key for option in options[:-1]] == [move.key for move in fresh]
+            self.decisions += 1
+        return super().select_option(player, options)
+
+
+def _zones(game):
+    return [
+        (zone.id, sorted(cardboard.name for cardboard in zone))
+        for zone in
+        game.zones
+    ]
+
+
+def _played(seed: int, fast_events: bool = False, per_event_cleanup: bool = False):
+    game = create_game(
+        [GreedyPolicy(seed), GreedyPolicy(seed + 1)],
+        max_turns = 60,
+        seed = seed,
+        fast_events = fast_events,
+    )
+    if per_event_cleanup:
+        has_listeners = game.has_listeners
+        game.has_listeners = lambda trigger: trigger in events._CLEANUP_TRIGGERS or has_listeners(trigger)
+    return game, run_game(game, seed)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_cached_legal_moves_match_fresh(seed: int):
+    policies = [_CheckedPolicy(seed), _CheckedPolicy(seed + 1)]
+    run_game(create_game(policies, max_turns = 60, seed = seed), seed)
+    assert all(policy.decisions for policy in policies)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_fast_resource_events_match_events(seed: int):
+    game, result = _played(seed)
+    fast_game, fast_result = _played(seed, fast_events = True)
+    assert fast_result == result
+    assert [[cardboard.id for cardboard in zone] for zone in fast_game.zones] == [
+        [cardboard.id for cardboard in zone] for zone in game.zones
+    ]
+    assert fast_game.condition_index.skipped
+    assert fast_game.interface.event_count < game.interface.event_count
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_bulk_cleanup_matches_per_event_cleanup(seed: int):
+    game, result = _played(seed)
+    slow_game, slow_result = _played(seed, per_event_cleanup = True)
+    assert slow_result == result
+    assert _zones(slow_game) == _zones(game)
+    assert slow_game.interface.event_count > game.interface.event_count
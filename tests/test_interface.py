@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms.interface import SKDummyController
+from sunkingdoms.simulation.interface import ChoiceRecorder, SKHeadlessInterface
+from sunkingdoms.simulation.policies import RandomPolicy
+from sunkingdoms.simulation.replay import ReplayPolicy
+from sunkingdoms.simulation.runner import create_signatures
+
+
+class _Player(object):
+
+    def __init__(self, signature):
+        self.signature = signature
+
+
+def _interface(policy, recorder = None):
+    signatures = create_signatures(2)
+    return (
+        SKHeadlessInterface(
+            SKDummyController(signatures),
+            {signature: policy for signature in signatures},
+            recorder = recorder,
+        ),
+        _Player(signatures[0]),
+    )
+
+
+def test_select_string_is_recorded_and_replayed():
+    recorder = ChoiceRecorder()
+    interface, player = _interface(RandomPolicy(3), recorder)
+    options = ('plus coin', 'loot')
+    choices = [interface.select_string(player, 'select mode', options) for _ in range(10)]
+
+    assert set(choices) <= set(options)
+    assert recorder.choices == [options.index(choice) for choice in choices]
+
+    replay, player = _interface(ReplayPolicy(recorder.choices))
+    assert [replay.select_string(player, 'select mode', options) for _ in range(10)] == choices
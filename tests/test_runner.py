@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms.simulation.runner import game_seeds
+
+
+def test_game_seeds_are_deterministic():
+    assert list(game_seeds(0, 10)) == list(game_seeds(0, 10))
+    assert list(game_seeds(0, 5)) == list(game_seeds(0, 10))[:5]
+
+
+def test_adjacent_batches_do_not_overlap():
+    assert not set(game_seeds(0, 1000)) & set(game_seeds(1, 1000))
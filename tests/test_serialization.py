@@ -0,0 +1,110 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms import events
+from sunkingdoms.game.profiling import EventProfiler
+from sunkingdoms.serialization import (
+    ACTION, CARD_TYPE, EVENT_FIELDS, EVENT_TYPE_IDS, FALSE, NONE, SerializationError, read_varint, write_varint,
+)
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import create_game, run_game
+
+
+class _EventCollector(EventProfiler):
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def event_started(self, event):
+        self.events.append(event)
+
+    def event_finished(self, event, success):
+        pass
+
+
+def _played_game(seed: int):
+    collector = _EventCollector()
+    game = create_game([GreedyPolicy(seed), GreedyPolicy(seed + 1)], max_turns = 60, seed = seed)
+    game.profiler = collector
+    run_game(game, seed)
+    game.profiler = None
+    return game, collector.events
+
+
+def _normalize(value):
+    return list(value) if isinstance(value, (list, tuple)) else value
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_events_round_trip(seed: int):
+    game, resolved = _played_game(seed)
+    seen = set()
+    for event in resolved:
+        decoded = event.deserialize(event.serialize())
+        assert decoded.event_type is event.__class__
+        for name in EVENT_FIELDS[EVENT_TYPE_IDS[event.__class__]]:
+            assert _normalize(decoded.values[name]) == _normalize(event.values.get(name)), (event, name)
+        seen.add(event.__class__)
+
+    assert {
+        events.PlayGame,
+        events.SetupGame,
+        events.CreateCardboard,
+        events.ShuffleZone,
+        events.TakeTurn,
+        events.CastCardboard,
+        events.BuyCardboard,
+        events.AddMoney,
+        events.MoveCardboard,
+    } <= seen
+
+
+def test_decode_rejects_garbage():
+    game, _ = _played_game(0)
+    buffer = bytearray()
+    write_varint(buffer, 10 ** 6)
+    with pytest.raises(SerializationError):
+        game.codec.decode(bytes(buffer))
+
+
+def test_decode_rejects_truncated_events():
+    game, resolved = _played_game(0)
+    for event in resolved[:200]:
+        data = event.serialize()
+        for length in range(len(data)):
+            with pytest.raises(SerializationError):
+                game.codec.decode(data[:length])
+
+
+def _encoded(event_type, *values):
+    buffer = bytearray()
+    write_varint(buffer, EVENT_TYPE_IDS[event_type])
+    for value in values:
+        if isinstance(value, int):
+            buffer.append(value)
+        else:
+            for part in value:
+                write_varint(buffer, part)
+    return bytes(buffer)
+
+
+def test_decode_rejects_unknown_card_and_action_ids():
+    game, _ = _played_game(0)
+    with pytest.raises(SerializationError):
+        game.codec.decode(_encoded(events.CreateCardboard, NONE, NONE, CARD_TYPE, (10 ** 4,), FALSE))
+    with pytest.raises(SerializationError):
+        game.codec.decode(_encoded(events.ActivateAction, NONE, NONE, ACTION, (10 ** 4, 0)))
+    with pytest.raises(SerializationError):
+        game.codec.decode(_encoded(events.ActivateAction, NONE, NONE, ACTION, (0, 10 ** 4)))
+    with pytest.raises(SerializationError):
+        game.codec.decode(_encoded(events.ActivateAction, NONE, NONE, 0x7f))
+
+
+def test_varint_round_trip():
+    for value in (0, 1, 127, 128, 300, 2 ** 40):
+        buffer = bytearray()
+        write_varint(buffer, value)
+        assert read_varint(bytes(buffer), 0) == (value, len(buffer))
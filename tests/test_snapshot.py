@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('gameframe')
+
+from sunkingdoms import carddb, cards, events
+from sunkingdoms.artifacts.artifacts import Faction
+from sunkingdoms.simulation.policies import GreedyPolicy
+from sunkingdoms.simulation.runner import create_game
+
+
+def _set_up_game(seed: int = 0):
+    game = create_game([GreedyPolicy(seed), GreedyPolicy(seed + 1)], seed = seed)
+    game.resolve_event(events.SetupGame)
+    return game
+
+
+def _capture(game):
+    players = list(game.players.all)
+    return {
+        'zones': [(zone.id, [cardboard.id for cardboard in zone]) for zone in game.zones],
+        'resources': [(player.influence, player.money, player.damage) for player in players],
+        'allegiance': [sorted(faction.value for faction in player.allegiance) for player in players],
+        'exhausted': [
+            (cardboard.id, cardboard.card.actions.exhausted)
+            for player in
+            players
+            for cardboard in
+            player.battlefield
+        ],
+        'cardboards': [cardboard.id for cardboard in game.cardboards],
+        'conditions': sorted(
+            (spec.serial, spec.condition_type.__name__, spec.kwargs.get('source'))
+            for spec in
+            game.condition_index.specs
+        ),
+    }
+
+
+def _find(player, card_type):
+    for zone in (player.hand, player.library, player.discard_pile):
+        for cardboard in zone:
+            if isinstance(cardboard.card, card_type):
+                return cardboard
+
+
+def _cast(game, player, cardboard):
+    if cardboard.zone is not player.hand:
+        game.resolve_event(
+            events.MoveCardboard,
+            player = player,
+            target = cardboard,
+            frm = cardboard.zone,
+            to = player.hand,
+        )
+    game.resolve_event(events.CastCardboard, player = player, target = cardboard)
+
+
+def test_restore_undoes_turns():
+    game = _set_up_game()
+    first, second = game.players.all
+
+    _cast(game, first, _find(first, cards.MechWorld))
+    fighter = _find(first, cards.BlobFighter)
+    _cast(game, first, fighter)
+    action, = fighter.card.actions
+    game.resolve_event(events.ActivateAction, player = first, target = fighter, action = action)
+    assert fighter.card.actions.exhausted
+    assert Faction.YELLOW in first.allegiance
+
+    snapshot = game.snapshot()
+    before = _capture(game)
+
+    game.resolve_event(events.TakeTurn, player = first)
+    game.resolve_event(
+        events.CreateCardboard,
+        player = second,
+        to = game.trade_row,
+        card_type = cards.MechWorld,
+    )
+    mech_world = game.cardboards[-1]
+    second.money = carddb.price(mech_world.card)
+    game.resolve_event(events.BuyCardboard, player = second, target = mech_world)
+    assert second.money == 0
+    assert mech_world in second.discard_pile
+    _cast(game, second, mech_world)
+    assert Faction.YELLOW in second.allegiance
+    for player in (second, first, second, first):
+        game.resolve_event(events.TakeTurn, player = player)
+
+    assert _capture(game) != before
+
+    game.restore(snapshot)
+    assert _capture(game) == before
+    assert Faction.YELLOW in first.allegiance
+    assert Faction.YELLOW not in second.allegiance
+    assert all(cardboard.zone is zone for zone in game.zones for cardboard in zone)
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('eventtree')
+pytest.importorskip('weakreflist')
+
+from sunkingdoms.zones import IndexedZone
+
+
+class _Cardboard(object):
+
+    def __init__(self, name: str):
+        self.name = name
+        self._zone = None
+
+    @property
+    def zone(self):
+        return self._zone
+
+
+def _zone(*names: str) -> IndexedZone:
+    zone = IndexedZone('library', ordered = True, private = False, face_up = False)
+    for name in names:
+        zone.join(_Cardboard(name))
+    return zone
+
+
+def _assert_consistent(zone: IndexedZone) -> None:
+    for position, cardboard in enumerate(zone):
+        assert cardboard in zone
+        assert zone._positions[cardboard] == position
+    assert len(zone._positions) == len(zone)
+
+
+@pytest.mark.parametrize('index', [3, 10, 100])
+def test_join_past_end(index: int):
+    zone = _zone('a', 'b', 'c')
+    cardboard = _Cardboard('d')
+    zone.join(cardboard, index)
+
+    assert zone[-1] is cardboard
+    _assert_consistent(zone)
+    zone.leave(cardboard)
+    assert cardboard not in zone
+    _assert_consistent(zone)
+
+
+@pytest.mark.parametrize('index', [-1, -2, -10])
+def test_join_negative_index(index: int):
+    zone = _zone('a', 'b', 'c')
+    cardboard = _Cardboard('d')
+    zone.join(cardboard, index)
+
+    assert cardboard in zone
+    _assert_consistent(zone)
+    zone.leave(cardboard)
+    assert [c.name for c in zone] == ['a', 'b', 'c']
+    _assert_consistent(zone)
+
+
+def test_join_into_empty_zone_with_index():
+    zone = _zone()
+    cardboard = _Cardboard('a')
+    zone.join(cardboard, 5)
+
+    assert cardboard in zone
+    assert zone.count('a') == 1
+    _assert_consistent(zone)